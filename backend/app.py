@@ -5,28 +5,145 @@ Author: Kenneth Feh
 Created: 2019
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, make_response, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-import os
+from functools import wraps
+from itertools import chain
+import atexit
+import queue
+import signal
 import sys
+import threading
 
-# Add parent directory to path to import TaskManager
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from cli.task_manager import TaskManager
+try:
+    from .service import (COMPRESS_MIN_SIZE, EVENT_HEARTBEAT, EVENT_POLL_INTERVAL,
+                          EVENT_QUEUE_SIZE, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL,
+                          ResponseCache, cache_key, codec, compress,
+                          create_task_manager, format_event, negotiate_encoding,
+                          page_params, parse_fields, search_params, search_payload,
+                          wants_minimal)
+except ImportError:
+    # Run as a script from within backend/
+    from service import (COMPRESS_MIN_SIZE, EVENT_HEARTBEAT, EVENT_POLL_INTERVAL,
+                         EVENT_QUEUE_SIZE, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL,
+                         ResponseCache, cache_key, codec, compress,
+                         create_task_manager, format_event, negotiate_encoding,
+                         page_params, parse_fields, search_params, search_payload,
+                         wants_minimal)
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
 
-# Get the absolute path for data directory
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), 'data')
-DATA_FILE = os.path.join(DATA_DIR, 'tasks.json')
+class CodecJSONProvider(JSONProvider):
+    """Serve JSON through the shared codec (orjson when installed)."""
+    
+    def dumps(self, obj, **kwargs):
+        return codec.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return codec.loads(s)
+
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
+app = Flask(__name__)
+app.json = CodecJSONProvider(app)
+# Enable CORS for all routes; expose the cache validators to the frontend
+CORS(app, expose_headers=['ETag'])
 
 # Initialize task manager with a backend-specific data file
-task_manager = TaskManager(data_file=DATA_FILE)
+task_manager = create_task_manager()
+
+# Persist any batched changes on interpreter exit
+atexit.register(task_manager.close)
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+def conditional(view):
+    """Serve a GET view conditionally on the task data version.
+    
+    Responses carry an ETag derived from ``task_manager.version``. A
+    request whose If-None-Match still matches gets an empty 304 without
+    the view running at all. There is no Last-Modified/If-Modified-Since
+    support: dates have one-second resolution and are not shared between
+    worker processes, while the version is persisted with the data.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Read before the data: a concurrent change can only make the tag
+        # older than the body, which costs the client one extra full fetch
+        etag = f'v{task_manager.version}'
+        
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        # Weak: the body may be re-encoded (e.g. compressed) in transit
+        response.set_etag(etag, weak=True)
+        # Let clients keep the response but revalidate before reusing it
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
+
+
+def cached(view):
+    """Serve a GET view's successful JSON responses from ``response_cache``.
+    
+    Equivalent queries share an entry (see ``cache_key``); a hit skips both
+    the query and JSON encoding.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = task_manager.version
+        key = cache_key(request.path, request.args.items(multi=True))
+        body = response_cache.get(version, key)
+        if body is not None:
+            return Response(body, mimetype='application/json')
+        
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response_cache.put(version, key, response.get_data())
+        return response
+    return wrapper
+
+
+def minimal_requested():
+    """True if the client sent ``Prefer: return=minimal``.
+    
+    Mutations then skip the task echo and message and return only what a
+    caller cannot already know (e.g. a new task's ID).
+    """
+    return wants_minimal(request.headers.get('Prefer'))
+
+
+def minimal_response(payload, status=200):
+    """JSON response for a request that preferred ``return=minimal``."""
+    response = jsonify(payload)
+    response.status_code = status
+    response.headers['Preference-Applied'] = 'return=minimal'
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """Compress large JSON bodies with the best encoding the client accepts.
+    
+    Streamed responses (NDJSON, events) are sent as they are produced.
+    """
+    if (response.is_streamed or response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 
 @app.route('/api/health', methods=['GET'])
@@ -36,25 +153,25 @@ def health_check():
 
 
 @app.route('/api/tasks', methods=['GET'])
+@conditional
+@cached
 def get_tasks():
-    """Get all tasks with optional filters."""
+    """Get tasks with optional filters, pagination and field projection."""
     try:
-        status = request.args.get('status', 'all')
-        category = request.args.get('category')
-        priority = request.args.get('priority')
-        
-        tasks = task_manager.list_tasks(
-            status=status,
-            category=category,
-            priority=priority
-        )
+        tasks, next_cursor = task_manager.list_tasks_page(**page_params(request.args))
         
         return jsonify({
             'success': True,
             'tasks': tasks,
-            'count': len(tasks)
+            'count': len(tasks),
+            'next_cursor': next_cursor
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -62,6 +179,109 @@ def get_tasks():
         }), 500
 
 
+@app.route('/api/tasks/search', methods=['GET'])
+@conditional
+@cached
+def search_tasks():
+    """Full-text search over task descriptions, best matches first."""
+    try:
+        params = search_params(request.args)
+        tasks, total = task_manager.search(**params)
+        
+        return jsonify(search_payload(tasks, total, params['offset'])), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/tasks/stream', methods=['GET'])
+def stream_tasks():
+    """Stream matching tasks as newline-delimited JSON."""
+    try:
+        rows = task_manager.iter_tasks(
+            status=request.args.get('status', 'all'),
+            category=request.args.get('category'),
+            priority=request.args.get('priority'),
+            fields=parse_fields(request.args.get('fields'))
+        )
+        # Pull the first row eagerly so bad arguments still get a 400
+        first = next(rows, None)
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    def generate():
+        if first is None:
+            return
+        for task in chain([first], rows):
+            yield codec.dumps(task) + b'\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
+
+@app.route('/api/events', methods=['GET'])
+def task_events():
+    """Stream task change events to the client as Server-Sent Events.
+    
+    Each event is a small delta (see ``TaskManager.subscribe``) sent with
+    its type as the SSE event name and the data version as its id. The
+    stream opens with a ``ready`` event carrying the current version.
+    """
+    events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+    overflowed = threading.Event()
+    
+    def listener(event):
+        try:
+            events.put_nowait(event)
+        except queue.Full:
+            # The client is too far behind for deltas to be useful
+            overflowed.set()
+    
+    def generate():
+        # Subscribe once streaming starts, so the finally clause always runs
+        unsubscribe = task_manager.subscribe(listener)
+        try:
+            yield format_event({'type': 'ready', 'version': task_manager.version})
+            idle = 0.0
+            while True:
+                if overflowed.is_set():
+                    overflowed.clear()
+                    while not events.empty():
+                        events.get_nowait()
+                    yield format_event({'type': 'reload', 'version': task_manager.version})
+                try:
+                    event = events.get(timeout=EVENT_POLL_INTERVAL)
+                except queue.Empty:
+                    # Reading the version picks up (and publishes) changes
+                    # made by other server processes
+                    task_manager.version
+                    idle += EVENT_POLL_INTERVAL
+                    if idle >= EVENT_HEARTBEAT:
+                        idle = 0.0
+                        yield ': heartbeat\n\n'
+                    continue
+                idle = 0.0
+                yield format_event(event)
+        finally:
+            unsubscribe()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/tasks', methods=['POST'])
 def create_task():
     """Create a new task."""
@@ -80,16 +300,79 @@ def create_task():
             category=data.get('category', 'general')
         )
         
-        # Get the created task
-        tasks = task_manager.list_tasks()
-        created_task = next((t for t in tasks if t['id'] == task_id), None)
-        
+        if minimal_requested():
+            return minimal_response({'success': True, 'id': task_id}, 201)
         return jsonify({
             'success': True,
-            'task': created_task,
+            'task': task_manager.get_task(task_id),
             'message': f'Task created with ID {task_id}'
         }), 201
         
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/tasks/batch', methods=['POST'])
+def batch_tasks():
+    """Apply many create/update/complete/delete operations atomically."""
+    try:
+        data = request.get_json()
+        
+        if not data or 'operations' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'Operations are required'
+            }), 400
+        
+        results = task_manager.apply_batch(data['operations'])
+        
+        if minimal_requested():
+            return minimal_response({'success': True, 'results': results})
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'message': f'Applied {len(results)} operation(s)'
+        }), 200
+        
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/tasks/<int:task_id>', methods=['GET'])
+@conditional
+def get_task(task_id):
+    """Get a single task."""
+    try:
+        task = task_manager.get_task(task_id)
+        
+        if task is not None:
+            return jsonify({
+                'success': True,
+                'task': task
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Task {task_id} not found'
+            }), 404
+            
     except Exception as e:
         return jsonify({
             'success': False,
@@ -117,13 +400,11 @@ def update_task(task_id):
         )
         
         if success:
-            # Get the updated task
-            tasks = task_manager.list_tasks()
-            updated_task = next((t for t in tasks if t['id'] == task_id), None)
-            
+            if minimal_requested():
+                return minimal_response({'success': True})
             return jsonify({
                 'success': True,
-                'task': updated_task,
+                'task': task_manager.get_task(task_id),
                 'message': f'Task {task_id} updated successfully'
             }), 200
         else:
@@ -132,6 +413,11 @@ def update_task(task_id):
                 'error': f'Task {task_id} not found'
             }), 404
             
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -146,13 +432,11 @@ def complete_task(task_id):
         success = task_manager.complete_task(task_id)
         
         if success:
-            # Get the completed task
-            tasks = task_manager.list_tasks()
-            completed_task = next((t for t in tasks if t['id'] == task_id), None)
-            
+            if minimal_requested():
+                return minimal_response({'success': True})
             return jsonify({
                 'success': True,
-                'task': completed_task,
+                'task': task_manager.get_task(task_id),
                 'message': f'Task {task_id} marked as completed'
             }), 200
         else:
@@ -175,6 +459,8 @@ def delete_task(task_id):
         success = task_manager.delete_task(task_id)
         
         if success:
+            if minimal_requested():
+                return minimal_response({'success': True})
             return jsonify({
                 'success': True,
                 'message': f'Task {task_id} deleted successfully'
@@ -198,6 +484,8 @@ def clear_completed_tasks():
     try:
         count = task_manager.clear_completed()
         
+        if minimal_requested():
+            return minimal_response({'success': True, 'count': count})
         return jsonify({
             'success': True,
             'count': count,
@@ -212,6 +500,8 @@ def clear_completed_tasks():
 
 
 @app.route('/api/statistics', methods=['GET'])
+@conditional
+@cached
 def get_statistics():
     """Get task statistics."""
     try:
@@ -229,6 +519,15 @@ def get_statistics():
         }), 500
 
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get response cache hit/miss counters."""
+    return jsonify({
+        'success': True,
+        'cache': response_cache.stats()
+    }), 200
+
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
@@ -248,5 +547,8 @@ def internal_error(error):
 
 
 if __name__ == '__main__':
+    # Turn SIGTERM (e.g. from start.sh) into a normal exit so atexit flushes
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     # Run in debug mode for development
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
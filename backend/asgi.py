@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Task Tracker Backend API - asynchronous (ASGI) variant of app.py
+
+Serves the same routes as the Flask app with Starlette. The event loop
+never blocks on TaskManager: reads run on a thread pool, and mutations,
+which may wait on disk writes, run on a dedicated single-thread executor
+so they queue behind each other rather than in front of reads. Run it with
+a production ASGI server, e.g. ``python serve.py`` (uvicorn).
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+try:
+    from .service import (COMPRESS_MIN_SIZE, EVENT_HEARTBEAT, EVENT_POLL_INTERVAL,
+                          EVENT_QUEUE_SIZE, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL,
+                          ResponseCache, cache_key, codec, compress,
+                          create_task_manager, format_event, negotiate_encoding,
+                          page_params, parse_fields, search_params, search_payload,
+                          wants_minimal)
+except ImportError:
+    # Imported as a top-level module from within backend/
+    from service import (COMPRESS_MIN_SIZE, EVENT_HEARTBEAT, EVENT_POLL_INTERVAL,
+                         EVENT_QUEUE_SIZE, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL,
+                         ResponseCache, cache_key, codec, compress,
+                         create_task_manager, format_event, negotiate_encoding,
+                         page_params, parse_fields, search_params, search_payload,
+                         wants_minimal)
+
+task_manager = create_task_manager()
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+# Mutations (and the disk writes they may wait on) run here one at a time
+write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='task-writer')
+
+
+def json_response(content, status_code=200, headers=None):
+    """Encode ``content`` with the shared codec."""
+    return Response(codec.dumps(content), status_code=status_code,
+                    headers=headers, media_type='application/json')
+
+
+def error_response(message, status_code):
+    return json_response({'success': False, 'error': message}, status_code)
+
+
+def minimal_requested(request):
+    """True if the client sent ``Prefer: return=minimal`` (see app.py)."""
+    return wants_minimal(request.headers.get('prefer'))
+
+
+def minimal_response(payload, status_code=200):
+    """JSON response for a request that preferred ``return=minimal``."""
+    return json_response(payload, status_code,
+                         headers={'Preference-Applied': 'return=minimal'})
+
+
+class CompressionMiddleware:
+    """Compress large JSON bodies with the best encoding the client accepts.
+
+    Only responses sent in a single body message are compressed; streamed
+    responses (NDJSON, events) pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get('accept-encoding')
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message['type'] == 'http.response.start':
+                # Hold the headers until the body shows whether it is streamed
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start['headers'])
+            body = message.get('body', b'')
+            if (not message.get('more_body')
+                    and headers.get('content-type', '').startswith('application/json')
+                    and 'content-encoding' not in headers
+                    and len(body) >= COMPRESS_MIN_SIZE):
+                headers.add_vary_header('Accept-Encoding')
+                encoding = negotiate_encoding(accept_encoding)
+                if encoding:
+                    body = compress(body, encoding)
+                    headers['Content-Encoding'] = encoding
+                    headers['Content-Length'] = str(len(body))
+                    message = {**message, 'body': body}
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+async def read(fn, *args, **kwargs):
+    """Run a blocking TaskManager read on the thread pool."""
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+
+async def write(fn, *args, **kwargs):
+    """Run a TaskManager mutation on the dedicated write executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(write_executor, partial(fn, *args, **kwargs))
+
+
+async def read_json(request):
+    """Decode the request body, or return None if it is not valid JSON."""
+    try:
+        return codec.loads(await request.body())
+    except ValueError:
+        return None
+
+
+def _etag_matches(header, etag):
+    """Weak comparison of an If-None-Match header against ``etag``."""
+    tags = {tag.strip() for tag in header.split(',')}
+    return '*' in tags or etag in {tag[2:] if tag.startswith('W/') else tag for tag in tags}
+
+
+async def conditional(request, view, cache=False):
+    """Serve a GET view conditionally on the task data version.
+
+    Mirrors the Flask app's ``conditional`` (and, with ``cache`` set,
+    ``cached``) decorators: a matching If-None-Match gets an empty 304
+    without the view running, and successful bodies can be served from
+    ``response_cache``.
+    """
+    version = await read(lambda: task_manager.version)
+    etag = f'"v{version}"'
+
+    if _etag_matches(request.headers.get('if-none-match', ''), etag):
+        response = Response(status_code=304)
+    else:
+        key = cache_key(request.url.path, request.query_params.multi_items())
+        body = response_cache.get(version, key) if cache else None
+        if body is not None:
+            response = Response(body, media_type='application/json')
+        else:
+            response = await view()
+            if response.status_code != 200:
+                return response
+            if cache:
+                response_cache.put(version, key, response.body)
+    response.headers['ETag'] = f'W/{etag}'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+async def health_check(request):
+    """Health check endpoint."""
+    return json_response({'status': 'healthy', 'service': 'task-tracker-api'})
+
+
+async def get_tasks(request):
+    """Get tasks with optional filters, pagination and field projection."""
+    async def view():
+        try:
+            tasks, next_cursor = await read(task_manager.list_tasks_page,
+                                            **page_params(request.query_params))
+            return json_response({
+                'success': True,
+                'tasks': tasks,
+                'count': len(tasks),
+                'next_cursor': next_cursor
+            })
+        except ValueError as e:
+            return error_response(str(e), 400)
+        except Exception as e:
+            return error_response(str(e), 500)
+    return await conditional(request, view, cache=True)
+
+
+async def search_tasks(request):
+    """Full-text search over task descriptions, best matches first."""
+    async def view():
+        try:
+            params = search_params(request.query_params)
+            tasks, total = await read(task_manager.search, **params)
+            return json_response(search_payload(tasks, total, params['offset']))
+        except ValueError as e:
+            return error_response(str(e), 400)
+        except Exception as e:
+            return error_response(str(e), 500)
+    return await conditional(request, view, cache=True)
+
+
+async def stream_tasks(request):
+    """Stream matching tasks as newline-delimited JSON."""
+    args = request.query_params
+    rows = task_manager.iter_tasks(
+        status=args.get('status', 'all'),
+        category=args.get('category'),
+        priority=args.get('priority'),
+        fields=parse_fields(args.get('fields'))
+    )
+    try:
+        # Pull the first row eagerly so bad arguments still get a 400
+        first = await read(next, rows, None)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    def generate():
+        if first is None:
+            return
+        yield codec.dumps(first) + b'\n'
+        for task in rows:
+            yield codec.dumps(task) + b'\n'
+
+    # Starlette iterates synchronous generators on the thread pool
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
+
+
+async def task_events(request):
+    """Stream task change events to the client as Server-Sent Events.
+
+    Same protocol as the Flask app's /api/events. Listeners are called on
+    whichever thread applied the change, so events are handed to the event
+    loop before being queued for this connection.
+    """
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+    overflowed = False
+
+    def deliver(event):
+        nonlocal overflowed
+        try:
+            events.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client is too far behind for deltas to be useful
+            overflowed = True
+
+    def listener(event):
+        loop.call_soon_threadsafe(deliver, event)
+
+    async def generate():
+        nonlocal overflowed
+        # Subscribe once streaming starts, so the finally clause always runs
+        unsubscribe = task_manager.subscribe(listener)
+        try:
+            version = await read(lambda: task_manager.version)
+            yield format_event({'type': 'ready', 'version': version})
+            idle = 0.0
+            while True:
+                if overflowed:
+                    overflowed = False
+                    while not events.empty():
+                        events.get_nowait()
+                    version = await read(lambda: task_manager.version)
+                    yield format_event({'type': 'reload', 'version': version})
+                try:
+                    event = await asyncio.wait_for(events.get(), EVENT_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Reading the version picks up (and publishes) changes
+                    # made by other server processes
+                    await read(lambda: task_manager.version)
+                    idle += EVENT_POLL_INTERVAL
+                    if idle >= EVENT_HEARTBEAT:
+                        idle = 0.0
+                        yield ': heartbeat\n\n'
+                    continue
+                idle = 0.0
+                yield format_event(event)
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(generate(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+async def create_task(request):
+    """Create a new task."""
+    data = await read_json(request)
+    if not data or 'description' not in data:
+        return error_response('Description is required', 400)
+
+    minimal = minimal_requested(request)
+
+    def create():
+        task_id = task_manager.add_task(
+            description=data['description'],
+            priority=data.get('priority', 'medium'),
+            category=data.get('category', 'general')
+        )
+        return task_id, None if minimal else task_manager.get_task(task_id)
+
+    try:
+        task_id, task = await write(create)
+        if minimal:
+            return minimal_response({'success': True, 'id': task_id}, 201)
+        return json_response({
+            'success': True,
+            'task': task,
+            'message': f'Task created with ID {task_id}'
+        }, 201)
+    except (ValueError, TypeError) as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def batch_tasks(request):
+    """Apply many create/update/complete/delete operations atomically."""
+    data = await read_json(request)
+    if not data or 'operations' not in data:
+        return error_response('Operations are required', 400)
+
+    try:
+        results = await write(task_manager.apply_batch, data['operations'])
+        if minimal_requested(request):
+            return minimal_response({'success': True, 'results': results})
+        return json_response({
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'message': f'Applied {len(results)} operation(s)'
+        })
+    except (ValueError, TypeError) as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e), 500)
+
+
+async def get_task(request):
+    """Get a single task."""
+    task_id = request.path_params['task_id']
+
+    async def view():
+        try:
+            task = await read(task_manager.get_task, task_id)
+        except Exception as e:
+            return error_response(str(e), 500)
+        if task is None:
+            return error_response(f'Task {task_id} not found', 404)
+        return json_response({'success': True, 'task': task})
+    return await conditional(request, view)
+
+
+async def update_task(request):
+    """Update an existing task."""
+    task_id = request.path_params['task_id']
+    data = await read_json(request)
+    if not data:
+        return error_response('No update data provided', 400)
+
+    minimal = minimal_requested(request)
+
+    def update():
+        success = task_manager.update_task(
+            task_id=task_id,
+            description=data.get('description'),
+            priority=data.get('priority'),
+            category=data.get('category')
+        )
+        if not success or minimal:
+            return success, None
+        return success, task_manager.get_task(task_id)
+
+    try:
+        success, task = await write(update)
+    except (ValueError, TypeError) as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e), 500)
+    if not success:
+        return error_response(f'Task {task_id} not found', 404)
+    if minimal:
+        return minimal_response({'success': True})
+    return json_response({
+        'success': True,
+        'task': task,
+        'message': f'Task {task_id} updated successfully'
+    })
+
+
+async def complete_task(request):
+    """Mark a task as completed."""
+    task_id = request.path_params['task_id']
+
+    minimal = minimal_requested(request)
+
+    def complete():
+        success = task_manager.complete_task(task_id)
+        if not success or minimal:
+            return success, None
+        return success, task_manager.get_task(task_id)
+
+    try:
+        success, task = await write(complete)
+    except Exception as e:
+        return error_response(str(e), 500)
+    if not success:
+        return error_response(f'Task {task_id} not found', 404)
+    if minimal:
+        return minimal_response({'success': True})
+    return json_response({
+        'success': True,
+        'task': task,
+        'message': f'Task {task_id} marked as completed'
+    })
+
+
+async def delete_task(request):
+    """Delete a task."""
+    task_id = request.path_params['task_id']
+    try:
+        success = await write(task_manager.delete_task, task_id)
+    except Exception as e:
+        return error_response(str(e), 500)
+    if not success:
+        return error_response(f'Task {task_id} not found', 404)
+    if minimal_requested(request):
+        return minimal_response({'success': True})
+    return json_response({
+        'success': True,
+        'message': f'Task {task_id} deleted successfully'
+    })
+
+
+async def clear_completed_tasks(request):
+    """Clear all completed tasks."""
+    try:
+        count = await write(task_manager.clear_completed)
+    except Exception as e:
+        return error_response(str(e), 500)
+    if minimal_requested(request):
+        return minimal_response({'success': True, 'count': count})
+    return json_response({
+        'success': True,
+        'count': count,
+        'message': f'Cleared {count} completed task(s)'
+    })
+
+
+async def get_statistics(request):
+    """Get task statistics."""
+    async def view():
+        try:
+            stats = await read(task_manager.get_statistics)
+        except Exception as e:
+            return error_response(str(e), 500)
+        return json_response({'success': True, 'statistics': stats})
+    return await conditional(request, view, cache=True)
+
+
+async def get_cache_stats(request):
+    """Get response cache hit/miss counters."""
+    return json_response({'success': True, 'cache': response_cache.stats()})
+
+
+async def http_error(request, exc):
+    """Handle HTTP errors (e.g. unknown endpoints) with a JSON body."""
+    message = 'Endpoint not found' if exc.status_code == 404 else exc.detail
+    return error_response(message, exc.status_code)
+
+
+async def internal_error(request, exc):
+    """Handle unexpected errors."""
+    return error_response('Internal server error', 500)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    # Let queued mutations finish, then persist any batched changes
+    await asyncio.get_running_loop().run_in_executor(None, write_executor.shutdown)
+    task_manager.close()
+
+
+routes = [
+    Route('/api/health', health_check, methods=['GET']),
+    Route('/api/tasks', get_tasks, methods=['GET']),
+    Route('/api/tasks', create_task, methods=['POST']),
+    Route('/api/tasks/search', search_tasks, methods=['GET']),
+    Route('/api/tasks/stream', stream_tasks, methods=['GET']),
+    Route('/api/tasks/batch', batch_tasks, methods=['POST']),
+    Route('/api/tasks/clear-completed', clear_completed_tasks, methods=['POST']),
+    Route('/api/tasks/{task_id:int}', get_task, methods=['GET']),
+    Route('/api/tasks/{task_id:int}', update_task, methods=['PUT']),
+    Route('/api/tasks/{task_id:int}', delete_task, methods=['DELETE']),
+    Route('/api/tasks/{task_id:int}/complete', complete_task, methods=['POST']),
+    Route('/api/statistics', get_statistics, methods=['GET']),
+    Route('/api/cache/stats', get_cache_stats, methods=['GET']),
+    Route('/api/events', task_events, methods=['GET']),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[
+        # Enable CORS for all routes; expose the cache validators to the frontend
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'],
+                   allow_headers=['*'], expose_headers=['ETag']),
+        Middleware(CompressionMiddleware)
+    ],
+    exception_handlers={HTTPException: http_error, 500: internal_error},
+    lifespan=lifespan
+)
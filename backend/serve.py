@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the ASGI Task Tracker API (asgi.py) using uvicorn.
+
+Configured through the environment: HOST (default 0.0.0.0), PORT (5001),
+WEB_CONCURRENCY worker processes (1) and LOG_LEVEL (info). Several workers
+require the default 'sync' TASK_DURABILITY, since batched durability
+assumes a single process owns the task store.
+"""
+
+import os
+import uvicorn
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+if __name__ == '__main__':
+    uvicorn.run(
+        'asgi:app',
+        app_dir=BASE_DIR,
+        host=os.environ.get('HOST', '0.0.0.0'),
+        port=int(os.environ.get('PORT', '5001')),
+        workers=int(os.environ.get('WEB_CONCURRENCY', '1')),
+        log_level=os.environ.get('LOG_LEVEL', 'info'),
+        proxy_headers=True
+    )
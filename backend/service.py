@@ -0,0 +1,256 @@
+"""
+Configuration and helpers shared by the Flask (app.py) and ASGI (asgi.py)
+Task Tracker API servers.
+"""
+
+from collections import OrderedDict
+import gzip
+import os
+import sys
+import threading
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Add parent directory to path to import TaskManager
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cli.task_manager import TaskManager
+from cli.storage import SQLiteTaskStore
+from cli import codec
+
+# Get the absolute path for data directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), 'data')
+DATA_FILE = os.path.join(DATA_DIR, 'tasks.json')
+
+# Storage backend: 'json' (snapshot + change log) or 'sqlite'
+TASK_STORE = os.environ.get('TASK_STORE', 'json').lower()
+DB_FILE = os.environ.get('TASK_DB_FILE', os.path.join(DATA_DIR, 'tasks.db'))
+
+# Persistence policy: 'sync' writes every change before responding,
+# 'batched' group-commits changes in the background
+TASK_DURABILITY = os.environ.get('TASK_DURABILITY', 'sync').lower()
+TASK_FLUSH_INTERVAL = float(os.environ.get('TASK_FLUSH_INTERVAL', '1.0'))
+TASK_FLUSH_THRESHOLD = int(os.environ.get('TASK_FLUSH_THRESHOLD', '100'))
+
+# Keep a columnar copy of the tasks for fast statistics and filtering
+TASK_COLUMNAR = os.environ.get('TASK_COLUMNAR', '0') == '1'
+
+# Largest page a client may request from GET /api/tasks
+MAX_PAGE_SIZE = 1000
+# Default number of results per page of GET /api/tasks/search
+SEARCH_PAGE_SIZE = 20
+
+# Server-side cache of list and statistics responses (size 0 disables it)
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '256'))
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', '30'))
+
+# Change feed: seconds between keep-alive comments on idle event streams,
+# and events buffered per client before it is told to reload instead
+EVENT_HEARTBEAT = float(os.environ.get('EVENT_HEARTBEAT', '15'))
+EVENT_QUEUE_SIZE = 1000
+# How often idle streams check for changes made by other server processes
+EVENT_POLL_INTERVAL = 1.0
+
+# Compress JSON responses of at least this many bytes (gzip, or brotli
+# when installed) if the client accepts it
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def create_task_manager():
+    """Create the TaskManager for the configured storage backend."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    options = {
+        'durability': TASK_DURABILITY,
+        'flush_interval': TASK_FLUSH_INTERVAL,
+        'flush_threshold': TASK_FLUSH_THRESHOLD,
+        'columnar': TASK_COLUMNAR
+    }
+    if TASK_STORE == 'sqlite':
+        store = SQLiteTaskStore(DB_FILE)
+        # Migrate an existing JSON store the first time SQLite is selected
+        count = store.migrate_json(DATA_FILE)
+        if count is not None:
+            print(f"Imported {count} task(s) from {DATA_FILE} into {DB_FILE}")
+        return TaskManager(data_file=DB_FILE, store=store, **options)
+    if TASK_STORE != 'json':
+        raise ValueError(f"Unknown TASK_STORE backend: {TASK_STORE}")
+    return TaskManager(data_file=DATA_FILE, **options)
+
+
+def parse_fields(value):
+    """Split a comma-separated ``fields`` parameter into a list, or None."""
+    if not value:
+        return None
+    return [f.strip() for f in value.split(',') if f.strip()] or None
+
+
+def int_param(args, name, default=None):
+    """Read an integer query parameter; raises ValueError if it is not one."""
+    value = args.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Parameter '{name}' must be an integer")
+
+
+def page_params(args):
+    """Translate GET /api/tasks query parameters into list_tasks_page arguments."""
+    limit = int_param(args, 'limit')
+    if limit is not None:
+        limit = min(limit, MAX_PAGE_SIZE)
+    return {
+        'status': args.get('status', 'all'),
+        'category': args.get('category'),
+        'priority': args.get('priority'),
+        'cursor': args.get('cursor'),
+        'limit': limit,
+        'fields': parse_fields(args.get('fields'))
+    }
+
+
+def search_params(args):
+    """Translate GET /api/tasks/search query parameters into search arguments."""
+    limit = int_param(args, 'limit', SEARCH_PAGE_SIZE)
+    offset = int_param(args, 'offset', 0)
+    return {
+        'query': args.get('q', ''),
+        'status': args.get('status', 'all'),
+        'category': args.get('category'),
+        'priority': args.get('priority'),
+        'limit': min(limit, MAX_PAGE_SIZE),
+        'offset': offset,
+        'fields': parse_fields(args.get('fields'))
+    }
+
+
+def search_payload(tasks, total, offset):
+    """Response body for one page of search results."""
+    end = offset + len(tasks)
+    return {
+        'success': True,
+        'tasks': tasks,
+        'count': len(tasks),
+        'total': total,
+        'next_offset': end if end < total else None
+    }
+
+
+def cache_key(path, items):
+    """Cache key for a GET request: the path plus non-empty params in sorted order."""
+    return (path, tuple(sorted((k, v) for k, v in items if v)))
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None."""
+    accepted = set()
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.partition(';')
+        params = params.replace(' ', '')
+        try:
+            # q=0 means "not acceptable"
+            if params.startswith('q=') and float(params[2:]) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    """Compress a response body with an encoding from ``negotiate_encoding``."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def wants_minimal(prefer):
+    """True if a Prefer header asks for ``return=minimal`` (RFC 7240)."""
+    for preference in (prefer or '').split(','):
+        token = preference.split(';')[0].replace(' ', '').lower()
+        if token == 'return=minimal':
+            return True
+    return False
+
+
+def format_event(event):
+    """Encode a change event as a Server-Sent Events message."""
+    return (f"id: {event['version']}\nevent: {event['type']}\n"
+            f"data: {codec.dumps(event).decode()}\n\n")
+
+
+class ResponseCache:
+    """LRU cache of serialized response bodies with a time-to-live.
+
+    Entries belong to one task data version. Seeing a newer version drops
+    every entry at once, so a mutation invalidates exactly the responses
+    it could have changed; bodies computed for an older version are never
+    stored.
+    """
+
+    def __init__(self, max_entries=256, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, body)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        """Drop all entries if ``version`` is newer; False if it is stale."""
+        if self._version is not None and version < self._version:
+            return False
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        return True
+
+    def get(self, version, key):
+        """Return the cached body for ``key`` at ``version``, or None."""
+        with self._lock:
+            entry = None
+            if self._check_version(version):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] < time.monotonic():
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, version, key, body):
+        """Store a body computed for ``version``."""
+        with self._lock:
+            if self.max_entries < 1 or not self._check_version(version):
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl
+            }
@@ -0,0 +1,128 @@
+"""
+Unit tests for the helpers shared by the Flask and ASGI servers.
+"""
+
+import pytest
+import service
+from service import ResponseCache, cache_key, int_param, negotiate_encoding, wants_minimal
+
+
+class TestResponseCache:
+    """Test suite for the versioned LRU response cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry goes first once full."""
+        cache = ResponseCache(max_entries=2)
+        cache.put(1, 'a', b'A')
+        cache.put(1, 'b', b'B')
+        assert cache.get(1, 'a') == b'A'
+        cache.put(1, 'c', b'C')
+
+        assert cache.get(1, 'b') is None
+        assert cache.get(1, 'a') == b'A'
+        assert cache.get(1, 'c') == b'C'
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that entries are dropped once their TTL has passed."""
+        now = [100.0]
+        monkeypatch.setattr(service.time, 'monotonic', lambda: now[0])
+        cache = ResponseCache(ttl=30)
+        cache.put(1, 'a', b'A')
+
+        now[0] += 29
+        assert cache.get(1, 'a') == b'A'
+        now[0] += 2
+        assert cache.get(1, 'a') is None
+        assert cache.stats()['entries'] == 0
+
+    def test_new_version_drops_entries(self):
+        """Test that seeing a newer data version invalidates everything."""
+        cache = ResponseCache()
+        cache.put(1, 'a', b'A')
+        cache.put(1, 'b', b'B')
+
+        assert cache.get(2, 'a') is None
+        assert cache.stats()['entries'] == 0
+
+    def test_stale_version_is_not_stored(self):
+        """Test that bodies computed for an older version are refused."""
+        cache = ResponseCache()
+        cache.put(2, 'a', b'new')
+        cache.put(1, 'a', b'old')
+        cache.put(1, 'b', b'old')
+
+        assert cache.get(2, 'a') == b'new'
+        assert cache.get(2, 'b') is None
+        assert cache.get(1, 'a') is None
+
+    def test_stats(self):
+        """Test the hit and miss counters."""
+        cache = ResponseCache()
+        cache.put(1, 'a', b'A')
+        cache.get(1, 'a')
+        cache.get(1, 'b')
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+
+class TestNegotiateEncoding:
+    """Test suite for Accept-Encoding negotiation."""
+
+    @pytest.fixture(params=[False, True], ids=['gzip-only', 'brotli'])
+    def brotli(self, request, monkeypatch):
+        """Run with and without brotli available."""
+        monkeypatch.setattr(service, 'brotli', object() if request.param else None)
+        return request.param
+
+    def test_prefers_brotli_when_available(self, brotli):
+        """Test that br wins over gzip only if brotli is installed."""
+        assert negotiate_encoding('gzip, deflate, br') == ('br' if brotli else 'gzip')
+        assert negotiate_encoding('br') == ('br' if brotli else None)
+
+    def test_q_zero_is_refused(self, brotli):
+        """Test that q=0 marks an encoding as not acceptable."""
+        assert negotiate_encoding('gzip;q=0') is None
+        assert negotiate_encoding('gzip; q=0, identity') is None
+        assert negotiate_encoding('br;q=0, gzip;q=0.5') == 'gzip'
+        assert negotiate_encoding('gzip;q=0.0') is None
+
+    def test_wildcard(self, brotli):
+        """Test that * accepts gzip unless it is itself refused."""
+        assert negotiate_encoding('*') == 'gzip'
+        assert negotiate_encoding('*;q=0') is None
+
+    def test_missing_or_unknown(self, brotli):
+        """Test headers that allow no supported encoding."""
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding('') is None
+        assert negotiate_encoding('deflate, identity') is None
+        assert negotiate_encoding('gzip;q=abc') is None
+
+
+def test_wants_minimal():
+    """Test Prefer header parsing, including parameters and other preferences."""
+    assert wants_minimal('return=minimal')
+    assert wants_minimal('Return=Minimal')
+    assert wants_minimal('respond-async, return=minimal; foo=bar')
+    assert wants_minimal('return = minimal')
+    assert not wants_minimal('return=representation')
+    assert not wants_minimal('handling=strict')
+    assert not wants_minimal(None)
+
+
+def test_int_param():
+    """Test that malformed integers raise instead of being ignored."""
+    assert int_param({'limit': '5'}, 'limit') == 5
+    assert int_param({}, 'limit') is None
+    assert int_param({'limit': ''}, 'limit', 20) == 20
+    with pytest.raises(ValueError, match="limit"):
+        int_param({'limit': 'abc'}, 'limit')
+
+
+def test_cache_key():
+    """Test that equivalent queries share a key."""
+    assert (cache_key('/api/tasks', [('status', 'all'), ('category', 'work')])
+            == cache_key('/api/tasks', [('category', 'work'), ('status', 'all'),
+                                        ('priority', '')]))
+    assert cache_key('/api/tasks', []) != cache_key('/api/statistics', [])
@@ -4,16 +4,86 @@ API Client for Task Tracker CLI to communicate with backend
 
 import requests
 import json
-from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Iterator, List, Dict, Optional, Any, Tuple, Union
+from urllib3.util.retry import Retry
+
+# Methods safe to resend after a dropped connection or a 502/503/504. DELETE
+# is left out: repeating one that already succeeded would report a 404.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT'])
+RETRY_STATUSES = (502, 503, 504)
+
+# Sent with mutations: the server then skips echoing the task back
+MINIMAL_RESPONSE = {'Prefer': 'return=minimal'}
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def task_params(status: str = 'all', category: Optional[str] = None,
+                priority: Optional[str] = None, **extra) -> Dict[str, Any]:
+    """Build query parameters for task listing endpoints, dropping unset values."""
+    params = {'status': status}
+    if category:
+        params['category'] = category
+    if priority:
+        params['priority'] = priority
+    params.update((key, value) for key, value in extra.items() if value)
+    return params
 
 
 class TaskAPIClient:
-    """Client for interacting with Task Tracker API."""
+    """Client for interacting with Task Tracker API.
     
-    def __init__(self, base_url: str = 'http://localhost:5001'):
-        """Initialize the API client."""
+    All requests go through one ``requests.Session``, so connections are
+    kept alive and reused instead of being opened per call, and gzip
+    responses are accepted and decoded transparently. Use the client as a
+    context manager (or call ``close()``) to release its connections.
+    """
+    
+    def __init__(self, base_url: str = 'http://localhost:5001', cache_size: int = 128,
+                 pool_size: int = 10, timeout: Timeout = (3.05, 30),
+                 retries: int = 3, backoff_factor: float = 0.2):
+        """Initialize the API client.
+        
+        Up to ``cache_size`` GET responses are kept with their ETags and
+        revalidated with conditional requests. ``pool_size`` is the number
+        of connections kept open for threads sharing the client; ``timeout``
+        is the (connect, read) timeout in seconds for every request.
+        Failed connection attempts, and idempotent requests that hit a
+        dropped connection or a 502/503/504, are retried up to ``retries``
+        times with exponential backoff starting at ``backoff_factor`` seconds.
+        """
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._cache: 'OrderedDict[Tuple, Tuple[str, Any]]' = OrderedDict()
+        
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=RETRY_STATUSES,
+                      allowed_methods=IDEMPOTENT_METHODS,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+    
+    def _request(self, method: str, path: str, **kwargs):
+        """Send a request to ``path`` under the API URL using the session."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, f"{self.api_url}{path}", **kwargs)
     
     def _handle_response(self, response):
         """Handle API response and raise exceptions if needed."""
@@ -25,11 +95,37 @@ class TaskAPIClient:
         except json.JSONDecodeError:
             raise Exception(f"Invalid response from server: {response.text}")
     
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None,
+             missing_ok: bool = False):
+        """GET a JSON resource, answering from the local cache on 304.
+        
+        With ``missing_ok`` set a 404 returns None instead of raising.
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        
+        response = self._request('GET', path, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            self._cache.move_to_end(key)
+            return cached[1]
+        if response.status_code == 404 and missing_ok:
+            return None
+        
+        data = self._handle_response(response)
+        etag = response.headers.get('ETag')
+        if etag and self.cache_size > 0:
+            self._cache[key] = (etag, data)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+    
     def add_task(self, description: str, priority: str = 'medium', 
                  category: str = 'general') -> int:
         """Add a new task via API."""
-        response = requests.post(
-            f"{self.api_url}/tasks",
+        response = self._request(
+            'POST', '/tasks', headers=MINIMAL_RESPONSE,
             json={
                 'description': description,
                 'priority': priority,
@@ -37,30 +133,101 @@ class TaskAPIClient:
             }
         )
         data = self._handle_response(response)
-        return data['task']['id']
+        return data['id']
+    
+    def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single task via API, or None if it does not exist."""
+        data = self._get(f"/tasks/{task_id}", missing_ok=True)
+        return data['task'] if data is not None else None
     
     def list_tasks(self, status: str = 'all', category: Optional[str] = None,
                    priority: Optional[str] = None) -> List[Dict[str, Any]]:
         """List tasks via API."""
-        params = {'status': status}
-        if category:
-            params['category'] = category
-        if priority:
-            params['priority'] = priority
-        
-        response = requests.get(f"{self.api_url}/tasks", params=params)
-        data = self._handle_response(response)
+        data = self._get('/tasks', task_params(status, category, priority))
         return data['tasks']
     
+    def list_tasks_page(self, status: str = 'all', category: Optional[str] = None,
+                        priority: Optional[str] = None, cursor: Optional[str] = None,
+                        limit: Optional[int] = None,
+                        fields: Optional[List[str]] = None
+                        ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of tasks via API; returns (tasks, next_cursor)."""
+        params = task_params(status, category, priority, cursor=cursor, limit=limit,
+                             fields=','.join(fields) if fields else None)
+        data = self._get('/tasks', params)
+        return data['tasks'], data.get('next_cursor')
+    
+    def iter_tasks(self, status: str = 'all', category: Optional[str] = None,
+                   priority: Optional[str] = None, page_size: int = 100,
+                   fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over tasks via API, fetching pages lazily."""
+        cursor = None
+        while True:
+            tasks, cursor = self.list_tasks_page(status, category, priority,
+                                                 cursor, page_size, fields)
+            yield from tasks
+            if not cursor:
+                break
+    
+    def search(self, query: str, status: str = 'all', category: Optional[str] = None,
+               priority: Optional[str] = None, limit: Optional[int] = None,
+               offset: int = 0, fields: Optional[List[str]] = None
+               ) -> Tuple[List[Dict[str, Any]], int]:
+        """Search task descriptions via API; returns (tasks, total matches)."""
+        params = task_params(status, category, priority, q=query, limit=limit,
+                             offset=offset, fields=','.join(fields) if fields else None)
+        data = self._get('/tasks/search', params)
+        return data['tasks'], data['total']
+    
+    def stream_tasks(self, status: str = 'all', category: Optional[str] = None,
+                     priority: Optional[str] = None,
+                     fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream tasks via the NDJSON endpoint, parsing rows as they arrive."""
+        params = task_params(status, category, priority,
+                             fields=','.join(fields) if fields else None)
+        with self._request('GET', '/tasks/stream', params=params,
+                           stream=True) as response:
+            if response.status_code >= 400:
+                self._handle_response(response)
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+    
+    def watch(self, read_timeout: float = 60.0) -> Iterator[Dict[str, Any]]:
+        """Yield task change events from the server-sent event stream.
+        
+        The first event is ``ready`` with the current data version; then
+        each change arrives as a small delta (``created``, ``updated``,
+        ``completed`` or ``deleted``), or ``reload`` when the client should
+        refetch everything. The generator ends when the server closes the
+        stream; ``read_timeout`` bounds the wait for the server's heartbeats.
+        """
+        with self._request('GET', '/events', stream=True,
+                           headers={'Accept': 'text/event-stream'},
+                           timeout=(5, read_timeout)) as response:
+            if response.status_code >= 400:
+                self._handle_response(response)
+            data = []
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    # Only data lines matter; the payload repeats the event type
+                    if line.startswith('data:'):
+                        data.append(line[5:].lstrip())
+                elif data:
+                    yield json.loads('\n'.join(data))
+                    data = []
+    
     def complete_task(self, task_id: int) -> bool:
         """Mark a task as completed via API."""
-        response = requests.post(f"{self.api_url}/tasks/{task_id}/complete")
+        response = self._request('POST', f"/tasks/{task_id}/complete",
+                                 headers=MINIMAL_RESPONSE)
         data = self._handle_response(response)
         return data['success']
     
     def delete_task(self, task_id: int) -> bool:
         """Delete a task via API."""
-        response = requests.delete(f"{self.api_url}/tasks/{task_id}")
+        response = self._request('DELETE', f"/tasks/{task_id}",
+                                 headers=MINIMAL_RESPONSE)
         data = self._handle_response(response)
         return data['success']
     
@@ -76,27 +243,45 @@ class TaskAPIClient:
         if category:
             update_data['category'] = category
         
-        response = requests.put(
-            f"{self.api_url}/tasks/{task_id}",
-            json=update_data
-        )
+        response = self._request('PUT', f"/tasks/{task_id}", json=update_data,
+                                 headers=MINIMAL_RESPONSE)
         data = self._handle_response(response)
         return data['success']
     
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[int]:
+        """Apply many operations atomically via API; returns affected task IDs."""
+        response = self._request('POST', '/tasks/batch', headers=MINIMAL_RESPONSE,
+                                 json={'operations': operations})
+        data = self._handle_response(response)
+        return data['results']
+    
+    def add_tasks(self, tasks: List[Dict[str, Any]]) -> List[int]:
+        """Add many tasks in one request; returns the new task IDs."""
+        return self.apply_batch([{'op': 'add', **task} for task in tasks])
+    
+    def complete_tasks(self, task_ids: List[int]) -> List[int]:
+        """Mark many tasks as completed in one request."""
+        return self.apply_batch([{'op': 'complete', 'id': task_id}
+                                 for task_id in task_ids])
+    
     def clear_completed(self) -> int:
         """Clear all completed tasks via API."""
-        response = requests.post(f"{self.api_url}/tasks/clear-completed")
+        response = self._request('POST', '/tasks/clear-completed',
+                                 headers=MINIMAL_RESPONSE)
         data = self._handle_response(response)
         return data['count']
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get task statistics via API."""
-        response = requests.get(f"{self.api_url}/statistics")
-        data = self._handle_response(response)
+        data = self._get('/statistics')
         return data['statistics']
     
     def check_connection(self) -> bool:
-        """Check if API is available."""
+        """Check if API is available.
+        
+        Sent outside the session so an unreachable server fails at once
+        instead of going through the retry schedule.
+        """
         try:
             response = requests.get(f"{self.api_url}/health", timeout=2)
             return response.status_code == 200
@@ -0,0 +1,247 @@
+"""
+Asynchronous API client for Task Tracker, for scripts that issue many
+concurrent requests. Requires httpx.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from .api_client import (IDEMPOTENT_METHODS, MINIMAL_RESPONSE, RETRY_STATUSES,
+                             Timeout, TaskAPIClient, task_params)
+except ImportError:
+    from api_client import (IDEMPOTENT_METHODS, MINIMAL_RESPONSE, RETRY_STATUSES,
+                            Timeout, TaskAPIClient, task_params)
+
+
+class AsyncTaskAPIClient:
+    """asyncio counterpart of TaskAPIClient.
+
+    Methods are coroutines with the same arguments and results as the
+    synchronous client. Requests share one ``httpx.AsyncClient``, so up to
+    ``pool_size`` connections are kept alive and reused; callers can run
+    many operations at once with ``asyncio.gather`` and the pool bounds how
+    many are in flight. Use it as an async context manager (or await
+    ``close()``) to release its connections.
+    """
+
+    def __init__(self, base_url: str = 'http://localhost:5001', cache_size: int = 128,
+                 pool_size: int = 10, timeout: Timeout = (3.05, 30),
+                 retries: int = 3, backoff_factor: float = 0.2):
+        """Initialize the client; the options match TaskAPIClient."""
+        if httpx is None:
+            raise ImportError("AsyncTaskAPIClient requires httpx (pip install httpx)")
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.cache_size = cache_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._cache: 'OrderedDict[Tuple, Tuple[str, Any]]' = OrderedDict()
+
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        self.client = httpx.AsyncClient(
+            base_url=self.api_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size,
+                                max_keepalive_connections=pool_size)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    _handle_response = TaskAPIClient._handle_response
+
+    async def _request(self, method: str, path: str, **kwargs):
+        """Send a request, retrying the same failures TaskAPIClient retries."""
+        idempotent = method in IDEMPOTENT_METHODS
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_factor * 2 ** (attempt - 1))
+            last = attempt == self.retries
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Nothing reached the server, so any method can be resent
+                if last:
+                    raise
+                continue
+            except httpx.TransportError:
+                if last or not idempotent:
+                    raise
+                continue
+            if last or not idempotent or response.status_code not in RETRY_STATUSES:
+                return response
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None,
+                   missing_ok: bool = False):
+        """GET a JSON resource, answering from the local cache on 304."""
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+
+        response = await self._request('GET', path, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            self._cache.move_to_end(key)
+            return cached[1]
+        if response.status_code == 404 and missing_ok:
+            return None
+
+        data = self._handle_response(response)
+        etag = response.headers.get('ETag')
+        if etag and self.cache_size > 0:
+            self._cache[key] = (etag, data)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    async def add_task(self, description: str, priority: str = 'medium',
+                       category: str = 'general') -> int:
+        """Add a new task via API."""
+        response = await self._request(
+            'POST', '/tasks', headers=MINIMAL_RESPONSE,
+            json={
+                'description': description,
+                'priority': priority,
+                'category': category
+            }
+        )
+        data = self._handle_response(response)
+        return data['id']
+
+    async def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single task via API, or None if it does not exist."""
+        data = await self._get(f"/tasks/{task_id}", missing_ok=True)
+        return data['task'] if data is not None else None
+
+    async def list_tasks(self, status: str = 'all', category: Optional[str] = None,
+                         priority: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List tasks via API."""
+        data = await self._get('/tasks', task_params(status, category, priority))
+        return data['tasks']
+
+    async def list_tasks_page(self, status: str = 'all', category: Optional[str] = None,
+                              priority: Optional[str] = None, cursor: Optional[str] = None,
+                              limit: Optional[int] = None,
+                              fields: Optional[List[str]] = None
+                              ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of tasks via API; returns (tasks, next_cursor)."""
+        params = task_params(status, category, priority, cursor=cursor, limit=limit,
+                             fields=','.join(fields) if fields else None)
+        data = await self._get('/tasks', params)
+        return data['tasks'], data.get('next_cursor')
+
+    async def iter_tasks(self, status: str = 'all', category: Optional[str] = None,
+                         priority: Optional[str] = None, page_size: int = 100,
+                         fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over tasks via API, fetching pages lazily."""
+        cursor = None
+        while True:
+            tasks, cursor = await self.list_tasks_page(status, category, priority,
+                                                       cursor, page_size, fields)
+            for task in tasks:
+                yield task
+            if not cursor:
+                break
+
+    async def search(self, query: str, status: str = 'all', category: Optional[str] = None,
+                     priority: Optional[str] = None, limit: Optional[int] = None,
+                     offset: int = 0, fields: Optional[List[str]] = None
+                     ) -> Tuple[List[Dict[str, Any]], int]:
+        """Search task descriptions via API; returns (tasks, total matches)."""
+        params = task_params(status, category, priority, q=query, limit=limit,
+                             offset=offset, fields=','.join(fields) if fields else None)
+        data = await self._get('/tasks/search', params)
+        return data['tasks'], data['total']
+
+    async def stream_tasks(self, status: str = 'all', category: Optional[str] = None,
+                           priority: Optional[str] = None,
+                           fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream tasks via the NDJSON endpoint, parsing rows as they arrive."""
+        params = task_params(status, category, priority,
+                             fields=','.join(fields) if fields else None)
+        async with self.client.stream('GET', '/tasks/stream', params=params) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                self._handle_response(response)
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def complete_task(self, task_id: int) -> bool:
+        """Mark a task as completed via API."""
+        response = await self._request('POST', f"/tasks/{task_id}/complete",
+                                       headers=MINIMAL_RESPONSE)
+        return self._handle_response(response)['success']
+
+    async def delete_task(self, task_id: int) -> bool:
+        """Delete a task via API."""
+        response = await self._request('DELETE', f"/tasks/{task_id}",
+                                       headers=MINIMAL_RESPONSE)
+        return self._handle_response(response)['success']
+
+    async def update_task(self, task_id: int, description: Optional[str] = None,
+                          priority: Optional[str] = None,
+                          category: Optional[str] = None) -> bool:
+        """Update task via API."""
+        update_data = {}
+        if description:
+            update_data['description'] = description
+        if priority:
+            update_data['priority'] = priority
+        if category:
+            update_data['category'] = category
+
+        response = await self._request('PUT', f"/tasks/{task_id}", json=update_data,
+                                       headers=MINIMAL_RESPONSE)
+        return self._handle_response(response)['success']
+
+    async def apply_batch(self, operations: List[Dict[str, Any]]) -> List[int]:
+        """Apply many operations atomically via API; returns affected task IDs."""
+        response = await self._request('POST', '/tasks/batch', headers=MINIMAL_RESPONSE,
+                                       json={'operations': operations})
+        return self._handle_response(response)['results']
+
+    async def add_tasks(self, tasks: List[Dict[str, Any]]) -> List[int]:
+        """Add many tasks in one request; returns the new task IDs."""
+        return await self.apply_batch([{'op': 'add', **task} for task in tasks])
+
+    async def complete_tasks(self, task_ids: List[int]) -> List[int]:
+        """Mark many tasks as completed in one request."""
+        return await self.apply_batch([{'op': 'complete', 'id': task_id}
+                                       for task_id in task_ids])
+
+    async def clear_completed(self) -> int:
+        """Clear all completed tasks via API."""
+        response = await self._request('POST', '/tasks/clear-completed',
+                                       headers=MINIMAL_RESPONSE)
+        return self._handle_response(response)['count']
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get task statistics via API."""
+        data = await self._get('/statistics')
+        return data['statistics']
+
+    async def check_connection(self) -> bool:
+        """Check if API is available, without retrying."""
+        try:
+            response = await self.client.get('/health', timeout=2)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
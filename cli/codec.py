@@ -0,0 +1,49 @@
+"""
+JSON codec shared by task storage and the API.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths produce the same bytes for task data: compact
+separators, UTF-8 output and ISO 8601 timestamps.
+"""
+
+import json
+from typing import Any, Dict, List, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values JSON has no type for (e.g. datetimes, tasks)."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON."""
+    if orjson is not None:
+        # Route datetimes through _default so both paths format them alike
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                      default=_default).encode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_task_file(path: str) -> List[Dict[str, Any]]:
+    """Read task definitions from a JSON array or newline-delimited JSON file."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if content.lstrip().startswith(b'['):
+        return loads(content)
+    return [loads(line) for line in content.splitlines() if line.strip()]
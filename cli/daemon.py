@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Resident Task Tracker daemon.
+
+Keeps one TaskManager loaded and serves it over a Unix socket, so CLI
+invocations skip importing and loading the store. The protocol is JSON
+lines: each request is ``{"method": ..., "params": {...}}`` and each reply
+is ``{"result": ...}`` or ``{"error": "..."}``. A client may send several
+requests over one connection.
+
+    python daemon.py                 # serve tasks.json on tasks.json.sock
+    python daemon.py --stop          # ask a running daemon to exit
+
+The daemon shares the store with other processes through the usual file
+lock, so the CLI can still fall back to opening the store itself (and the
+API server can use the same data file) while it runs.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .display import display_statistics, display_tasks
+    from .task import Task
+except ImportError:
+    from display import display_statistics, display_tasks
+    from task import Task
+
+DEFAULT_DATA_FILE = 'tasks.json'
+# Requests of one CLI command are tiny; anything larger is a broken client
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+# TaskManager methods the daemon exposes
+METHODS = frozenset([
+    'add_task', 'get_task', 'list_tasks', 'search', 'complete_task', 'delete_task',
+    'update_task', 'clear_completed', 'apply_batch', 'get_statistics'
+])
+
+
+def socket_path(data_file: str = DEFAULT_DATA_FILE) -> str:
+    """Socket of the daemon serving ``data_file`` (TASK_DAEMON_SOCKET overrides)."""
+    return os.environ.get('TASK_DAEMON_SOCKET', f"{data_file}.sock")
+
+
+class DaemonClient:
+    """Proxy with the TaskManager methods the CLI uses, backed by a daemon.
+
+    Results match the manager's: tasks come back as Task objects and
+    search returns ``(tasks, total)``.
+    """
+
+    def __init__(self, path: str, timeout: float = 30):
+        """Connect to the daemon; raises OSError if none is listening."""
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(path)
+        except OSError:
+            self._sock.close()
+            raise
+        self._file = self._sock.makefile('rb')
+
+    @classmethod
+    def connect(cls, path: Optional[str] = None) -> Optional['DaemonClient']:
+        """Return a client for a running daemon, or None if there is none."""
+        path = path or socket_path()
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except OSError:
+            return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._sock.close()
+
+    def call(self, method: str, **params) -> Any:
+        """Send one request and return its result."""
+        # The standard json module imports faster than orjson (see codec),
+        # and the messages are small
+        self._sock.sendall(json.dumps({'method': method, 'params': params}).encode() + b'\n')
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Task daemon closed the connection")
+        reply = json.loads(line)
+        if 'error' in reply:
+            raise Exception(reply['error'])
+        return reply['result']
+
+    def add_task(self, description: str, priority: str = 'medium',
+                 category: str = 'general') -> int:
+        return self.call('add_task', description=description, priority=priority,
+                         category=category)
+
+    def get_task(self, task_id: int) -> Optional[Task]:
+        data = self.call('get_task', task_id=task_id)
+        return Task.from_dict(data) if data is not None else None
+
+    def list_tasks(self, status: str = 'all', category: Optional[str] = None,
+                   priority: Optional[str] = None) -> List[Task]:
+        tasks = self.call('list_tasks', status=status, category=category, priority=priority)
+        return [Task.from_dict(task) for task in tasks]
+
+    def search(self, query: str, status: str = 'all', category: Optional[str] = None,
+               priority: Optional[str] = None, limit: Optional[int] = None,
+               offset: int = 0) -> Tuple[List[Task], int]:
+        tasks, total = self.call('search', query=query, status=status, category=category,
+                                 priority=priority, limit=limit, offset=offset)
+        return [Task.from_dict(task) for task in tasks], total
+
+    def complete_task(self, task_id: int) -> bool:
+        return self.call('complete_task', task_id=task_id)
+
+    def delete_task(self, task_id: int) -> bool:
+        return self.call('delete_task', task_id=task_id)
+
+    def update_task(self, task_id: int, description: Optional[str] = None,
+                    priority: Optional[str] = None, category: Optional[str] = None) -> bool:
+        return self.call('update_task', task_id=task_id, description=description,
+                         priority=priority, category=category)
+
+    def clear_completed(self) -> int:
+        return self.call('clear_completed')
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[int]:
+        return self.call('apply_batch', operations=operations)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return self.call('get_statistics')
+
+    def shutdown(self) -> None:
+        """Ask the daemon to exit once it has replied."""
+        self.call('shutdown')
+
+    def display_tasks(self, tasks: List[Task]) -> None:
+        display_tasks(tasks)
+
+    def display_statistics(self, stats: Dict[str, Any]) -> None:
+        display_statistics(stats)
+
+
+def dispatch(manager, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one request against ``manager`` and build its reply."""
+    method = request.get('method')
+    if method not in METHODS:
+        return {'error': f"Unknown method: {method}"}
+    try:
+        return {'result': getattr(manager, method)(**request.get('params', {}))}
+    except Exception as e:
+        # Report the failure to the client; the daemon keeps serving
+        return {'error': str(e)}
+
+
+def create_server(manager, path: str):
+    """Bind a threaded Unix socket server for ``manager`` at ``path``.
+
+    A stale socket left by a crashed daemon is replaced; a live one makes
+    this raise OSError.
+    """
+    # Imported here so CLI clients importing this module do not pay for them
+    import socketserver
+    import threading
+    try:
+        from . import codec
+    except ImportError:
+        import codec
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in iter(lambda: self.rfile.readline(MAX_REQUEST_SIZE), b''):
+                if len(line) >= MAX_REQUEST_SIZE and not line.endswith(b'\n'):
+                    # Skip the rest of the request rather than parse its tail
+                    # as the next one
+                    while line and not line.endswith(b'\n'):
+                        line = self.rfile.readline(MAX_REQUEST_SIZE)
+                    reply = {'error': f"Request too large (limit {MAX_REQUEST_SIZE} bytes)"}
+                    self.wfile.write(codec.dumps(reply) + b'\n')
+                    continue
+                if not line.strip():
+                    continue
+                try:
+                    request = codec.loads(line)
+                except ValueError:
+                    request = None
+                if not isinstance(request, dict):
+                    reply = {'error': 'Invalid request'}
+                else:
+                    if request.get('method') == 'shutdown':
+                        self.wfile.write(codec.dumps({'result': True}) + b'\n')
+                        self.server.stopping = True
+                        return
+                    reply = dispatch(manager, request)
+                self.wfile.write(codec.dumps(reply) + b'\n')
+
+        def finish(self):
+            super().finish()
+            if getattr(self.server, 'stopping', False):
+                # shutdown() waits for serve_forever, so call it off this thread
+                threading.Thread(target=self.server.shutdown).start()
+
+    client = DaemonClient.connect(path)
+    if client is not None:
+        client.close()
+        raise OSError(f"A task daemon is already listening on {path}")
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = socketserver.ThreadingUnixStreamServer(path, Handler, bind_and_activate=False)
+    server.daemon_threads = True
+    try:
+        server.server_bind()
+        # Only the owner may talk to the daemon
+        os.chmod(path, 0o600)
+        server.server_activate()
+    except OSError:
+        server.server_close()
+        raise
+    return server
+
+
+def serve(data_file: str = DEFAULT_DATA_FILE, path: Optional[str] = None) -> None:
+    """Load ``data_file`` and serve it until stopped."""
+    import signal
+    try:
+        from .task_manager import TaskManager
+    except ImportError:
+        from task_manager import TaskManager
+
+    path = path or socket_path(data_file)
+    # Reads in the daemon touch every task sooner or later, so load eagerly
+    manager = TaskManager(data_file=data_file)
+    try:
+        server = create_server(manager, path)
+    except OSError:
+        manager.close()
+        raise
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"Task daemon serving {data_file} on {path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+        manager.close()
+
+
+def main():
+    """Command-line entry point: run or stop the daemon."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Keep the task store loaded for fast CLI calls')
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE,
+                        help=f'Task data file (default: {DEFAULT_DATA_FILE})')
+    parser.add_argument('--socket', help='Socket path (default: <data file>.sock)')
+    parser.add_argument('--stop', action='store_true', help='Stop a running daemon')
+    args = parser.parse_args()
+
+    if args.stop:
+        client = DaemonClient.connect(args.socket or socket_path(args.data_file))
+        if client is None:
+            print("No task daemon is running.")
+            return
+        with client:
+            client.shutdown()
+        print("Task daemon stopped.")
+        return
+    try:
+        serve(args.data_file, args.socket)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Terminal output for the Task Tracker CLI.
+
+Kept apart from task_manager so the CLI can print results it got from a
+daemon without importing the manager and its storage backends.
+"""
+
+from typing import Any, Dict, List
+
+try:
+    from .task import Task
+except ImportError:
+    from task import Task
+
+
+def priority_symbol(priority: str) -> str:
+    """Get a visual symbol for priority level."""
+    symbols = {
+        'low': '🟢 Low',
+        'medium': '🟡 Med',
+        'high': '🔴 HIGH!'
+    }
+    return symbols.get(priority, '⚪ Unknown')
+
+
+def display_tasks(tasks: List[Task]) -> None:
+    """Display tasks in a formatted table."""
+    if not tasks:
+        print("No tasks to display.")
+        return
+
+    # Print header
+    print("\n" + "=" * 80)
+    print(f"{'ID':<5} {'Status':<12} {'Priority':<10} {'Category':<15} {'Description':<30}")
+    print("=" * 80)
+
+    # Print tasks
+    for task in tasks:
+        status_symbol = "[X]" if task.status == 'completed' else "[ ]"
+        description = task.description[:30] + '...' if len(task.description) > 30 else task.description
+
+        print(f"{task.id:<5} {status_symbol:<12} {priority_symbol(task.priority):<10} "
+              f"{task.category:<15} {description:<30}")
+
+    print("=" * 80)
+    print(f"Total: {len(tasks)} task(s)\n")
+
+
+def display_statistics(stats: Dict[str, Any]) -> None:
+    """Display task statistics."""
+    print("\n" + "=" * 50)
+    print("TASK STATISTICS")
+    print("=" * 50)
+
+    print(f"Total tasks:      {stats['total']}")
+    print(f"Pending tasks:    {stats['pending']}")
+    print(f"Completed tasks:  {stats['completed']}")
+    print(f"Completion rate:  {stats['completion_rate']}%")
+
+    if stats['by_priority']:
+        print("\nBy Priority:")
+        for priority, count in stats['by_priority'].items():
+            print(f"  {priority.capitalize():<10} {count}")
+
+    if stats['by_category']:
+        print("\nBy Category:")
+        for category, count in sorted(stats['by_category'].items()):
+            print(f"  {category:<15} {count}")
+
+    print("=" * 50 + "\n")
@@ -6,11 +6,8 @@ Created: 2019
 """
 
 import argparse
-import json
-import os
 import sys
-from datetime import datetime
-from task_manager import TaskManager
+from daemon import DaemonClient
 
 
 def main():
@@ -54,6 +51,20 @@ def main():
                               help='New task priority')
     update_parser.add_argument('-c', '--category', help='New task category')
     
+    # Search tasks command
+    search_parser = subparsers.add_parser('search', help='Search task descriptions')
+    search_parser.add_argument('query', nargs='+', help='Words to search for '
+                                                       '(prefixes of 3+ letters match)')
+    search_parser.add_argument('-s', '--status', choices=['pending', 'completed', 'all'],
+                              default='all', help='Filter by status (default: all)')
+    search_parser.add_argument('-c', '--category', help='Filter by category')
+    search_parser.add_argument('-p', '--priority', choices=['low', 'medium', 'high'],
+                              help='Filter by priority')
+    search_parser.add_argument('-n', '--limit', type=int, default=20,
+                              help='Number of results to show (default: 20)')
+    search_parser.add_argument('--offset', type=int, default=0,
+                              help='Number of results to skip (default: 0)')
+    
     # Statistics command
     stats_parser = subparsers.add_parser('stats', help='Show task statistics')
     
@@ -62,10 +73,19 @@ def main():
     clear_parser.add_argument('-f', '--force', action='store_true',
                              help='Skip confirmation prompt')
     
+    # Import tasks command
+    import_parser = subparsers.add_parser('import', help='Import tasks from a file')
+    import_parser.add_argument('file', help='JSON array or newline-delimited JSON file '
+                                            'of tasks (description, priority, category)')
+    
     args = parser.parse_args()
     
-    # Initialize task manager
-    task_manager = TaskManager()
+    # Use a running task daemon if there is one; otherwise open the store
+    # here, lazily, since one command touches few tasks
+    task_manager = DaemonClient.connect()
+    if task_manager is None:
+        from task_manager import TaskManager
+        task_manager = TaskManager(lazy=True)
     
     try:
         if args.command == 'add':
@@ -118,6 +138,22 @@ def main():
                 print(f"Error: Task {args.task_id} not found.")
                 sys.exit(1)
                 
+        elif args.command == 'search':
+            tasks, total = task_manager.search(
+                ' '.join(args.query),
+                status=args.status,
+                category=args.category,
+                priority=args.priority,
+                limit=args.limit,
+                offset=args.offset
+            )
+            
+            if not tasks:
+                print("No matching tasks found.")
+            else:
+                task_manager.display_tasks(tasks)
+                print(f"Showing {len(tasks)} of {total} match(es).")
+                
         elif args.command == 'stats':
             stats = task_manager.get_statistics()
             task_manager.display_statistics(stats)
@@ -132,6 +168,17 @@ def main():
             count = task_manager.clear_completed()
             print(f"Cleared {count} completed task(s).")
             
+        elif args.command == 'import':
+            from codec import read_task_file
+            operations = [
+                {'op': 'add', 'description': task.get('description'),
+                 'priority': task.get('priority', 'medium'),
+                 'category': task.get('category', 'general')}
+                for task in read_task_file(args.file)
+            ]
+            task_ids = task_manager.apply_batch(operations)
+            print(f"Imported {len(task_ids)} task(s).")
+            
         else:
             parser.print_help()
             
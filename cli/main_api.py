@@ -6,22 +6,88 @@ Created: 2019
 """
 
 import argparse
+import json
+import os
 import sys
-from api_client import TaskAPIClient
-from task_manager import TaskManager
+import time
+from daemon import DaemonClient
+
+API_URL = os.environ.get('TASK_API_URL', 'http://localhost:5001')
+
+# Remember whether the API answered, so most commands skip the health check
+API_STATUS_FILE = os.environ.get(
+    'TASK_API_STATUS_FILE',
+    os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                 'task-tracker', 'api-status.json')
+)
+API_STATUS_TTL = float(os.environ.get('TASK_API_STATUS_TTL', '60'))
+# A down API is re-checked sooner, so a restarted server is picked up quickly
+API_DOWN_TTL = 10
+
+
+def read_api_status(base_url):
+    """Return the cached availability of the API at ``base_url``, or None if unknown."""
+    try:
+        with open(API_STATUS_FILE) as f:
+            entry = json.load(f).get(base_url)
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not entry:
+        return None
+    ttl = API_STATUS_TTL if entry.get('available') else API_DOWN_TTL
+    if time.time() - entry.get('checked_at', 0) > ttl:
+        return None
+    return entry.get('available')
+
+
+def write_api_status(base_url, available):
+    """Cache the availability of the API at ``base_url`` (None forgets it)."""
+    try:
+        with open(API_STATUS_FILE) as f:
+            statuses = json.load(f)
+    except (OSError, ValueError):
+        statuses = {}
+    if not isinstance(statuses, dict):
+        statuses = {}
+    statuses[base_url] = {'available': available, 'checked_at': time.time()}
+    
+    temp_file = f"{API_STATUS_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(API_STATUS_FILE), exist_ok=True)
+        with open(temp_file, 'w') as f:
+            json.dump(statuses, f)
+        os.replace(temp_file, API_STATUS_FILE)
+    except OSError:
+        # The cache is only an optimization
+        pass
 
 
 def get_client(use_api=True):
-    """Get appropriate client based on API availability."""
+    """Get appropriate client based on API availability.
+    
+    The health check result is cached for API_STATUS_TTL seconds. Local
+    mode goes through a running task daemon when there is one.
+    """
     if use_api:
-        client = TaskAPIClient()
-        if client.check_connection():
-            return client, True
-        else:
-            print("Warning: API not available, falling back to local mode")
+        available = read_api_status(API_URL)
+        if available is not False:
+            # Imported only in API mode: requests is slow to import
+            from api_client import TaskAPIClient
+            client = TaskAPIClient(API_URL)
+            if available is None:
+                available = client.check_connection()
+                write_api_status(API_URL, available)
+            if available:
+                return client, True
+            client.close()
+        print("Warning: API not available, falling back to local mode")
     
-    # Fall back to local task manager
-    return TaskManager(), False
+    # Fall back to a task daemon, or the local task manager
+    client = DaemonClient.connect()
+    if client is None:
+        from task_manager import TaskManager
+        client = TaskManager(lazy=True)
+    return client, False
 
 
 def display_tasks(tasks):
@@ -116,6 +182,20 @@ def main():
                               help='New task priority')
     update_parser.add_argument('-c', '--category', help='New task category')
     
+    # Search tasks command
+    search_parser = subparsers.add_parser('search', help='Search task descriptions')
+    search_parser.add_argument('query', nargs='+', help='Words to search for '
+                                                       '(prefixes of 3+ letters match)')
+    search_parser.add_argument('-s', '--status', choices=['pending', 'completed', 'all'],
+                              default='all', help='Filter by status (default: all)')
+    search_parser.add_argument('-c', '--category', help='Filter by category')
+    search_parser.add_argument('-p', '--priority', choices=['low', 'medium', 'high'],
+                              help='Filter by priority')
+    search_parser.add_argument('-n', '--limit', type=int, default=20,
+                              help='Number of results to show (default: 20)')
+    search_parser.add_argument('--offset', type=int, default=0,
+                              help='Number of results to skip (default: 0)')
+    
     # Statistics command
     stats_parser = subparsers.add_parser('stats', help='Show task statistics')
     
@@ -124,6 +204,11 @@ def main():
     clear_parser.add_argument('-f', '--force', action='store_true',
                              help='Skip confirmation prompt')
     
+    # Import tasks command
+    import_parser = subparsers.add_parser('import', help='Import tasks from a file')
+    import_parser.add_argument('file', help='JSON array or newline-delimited JSON file '
+                                            'of tasks (description, priority, category)')
+    
     args = parser.parse_args()
     
     # Get appropriate client
@@ -184,6 +269,22 @@ def main():
                 print(f"Error: Task {args.task_id} not found.")
                 sys.exit(1)
                 
+        elif args.command == 'search':
+            tasks, total = client.search(
+                ' '.join(args.query),
+                status=args.status,
+                category=args.category,
+                priority=args.priority,
+                limit=args.limit,
+                offset=args.offset
+            )
+            
+            if is_api:
+                display_tasks(tasks)
+            else:
+                client.display_tasks(tasks)
+            print(f"Showing {len(tasks)} of {total} match(es).")
+                
         elif args.command == 'stats':
             stats = client.get_statistics()
             if is_api:
@@ -201,10 +302,25 @@ def main():
             count = client.clear_completed()
             print(f"Cleared {count} completed task(s).")
             
+        elif args.command == 'import':
+            from codec import read_task_file
+            operations = [
+                {'op': 'add', 'description': task.get('description'),
+                 'priority': task.get('priority', 'medium'),
+                 'category': task.get('category', 'general')}
+                for task in read_task_file(args.file)
+            ]
+            task_ids = client.apply_batch(operations)
+            print(f"Imported {len(task_ids)} task(s).")
+            
         else:
             parser.print_help()
             
     except Exception as e:
+        if is_api and isinstance(e, OSError):
+            # A request failed in transit (requests errors are OSErrors), so
+            # check the API again next time instead of trusting the cache
+            write_api_status(API_URL, None)
         print(f"Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
 
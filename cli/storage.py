@@ -0,0 +1,711 @@
+"""
+Storage backends for TaskManager persistence.
+
+A store turns the change records produced by TaskManager mutations into
+durable state and rebuilds the task list from that state on startup.
+"""
+
+import mmap
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from . import codec
+    from .locking import FileLock
+except ImportError:
+    # Imported as a top-level module from within cli/
+    import codec
+    from locking import FileLock
+
+
+class TaskStore:
+    """Interface implemented by all TaskManager storage backends."""
+
+    # Stores that can answer filtered listings and statistics themselves
+    # set this and implement query_tasks() and count_tasks().
+    queryable = False
+
+    def load(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return the persisted task list and store metadata.
+
+        Metadata holds ``next_id`` and the data ``version`` (the number of
+        change records written so far) when the store knows them.
+        """
+        raise NotImplementedError
+
+    def load_lazy(self) -> Optional[Tuple['MappedSnapshot', List[Dict[str, Any]], Dict[str, Any]]]:
+        """Open the persisted tasks without decoding them.
+
+        Returns a snapshot whose tasks are decoded on access, the change
+        records to apply over it, and store metadata as for load(); or None
+        if the store only supports full loads.
+        """
+        return None
+
+    def write(self, records: List[Dict[str, Any]],
+              snapshot: Callable[[], Tuple[List[Dict[str, Any]], Dict[str, Any]]]) -> None:
+        """Persist change records; ``snapshot`` yields the full current state."""
+        raise NotImplementedError
+
+    def compact(self, tasks: List[Dict[str, Any]], meta: Dict[str, Any]) -> None:
+        """Fold all persisted changes into a single snapshot of ``tasks``."""
+        raise NotImplementedError
+
+    def lock(self):
+        """Return a context manager that excludes other processes from the store."""
+        return nullcontext()
+
+    def has_changes(self) -> bool:
+        """Cheaply check whether another process changed the store since it was read."""
+        return False
+
+    def read_changes(self) -> Optional[List[Dict[str, Any]]]:
+        """Return change records written by other processes since the last read.
+
+        Returns None when the changes cannot be expressed as records and the
+        caller must reload the store in full.
+        """
+        return []
+
+
+def apply_record(tasks: Dict[int, Dict[str, Any]], record: Dict[str, Any],
+                 factory: Callable[[Dict[str, Any]], Any] = dict) -> None:
+    """Apply a single change record to an id-keyed task mapping.
+
+    Added tasks are built with ``factory``. Records are idempotent with
+    respect to the final state, so replaying a log over a snapshot that
+    already contains its effects is harmless.
+    """
+    op = record.get('op')
+    if op == 'add':
+        task = factory(record['task'])
+        tasks[task['id']] = task
+    elif op == 'update':
+        task = tasks.get(record['id'])
+        if task is not None:
+            task.update(record['changes'])
+    elif op == 'delete':
+        for task_id in record['ids']:
+            tasks.pop(task_id, None)
+    else:
+        raise ValueError(f"Unknown change record: {op!r}")
+
+
+def read_snapshot(data_file: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Read a snapshot file, accepting both the envelope and bare-list formats."""
+    if not os.path.exists(data_file):
+        return [], {}
+    with open(data_file, 'rb') as f:
+        content = f.read()
+    if not content:
+        return [], {}
+    try:
+        data = codec.loads(content)
+    except ValueError:
+        # More than one document: the line format (see encode_snapshot_lines)
+        header, *lines = content.split(b'\n')
+        return [codec.loads(line) for line in lines if line.strip()], codec.loads(header)
+    if isinstance(data, list):
+        # Snapshots written before metadata was persisted
+        return data, {}
+    # A line-format snapshot of no tasks is just its header
+    tasks = data.pop('tasks', [])
+    return tasks, data
+
+
+def encode_snapshot(tasks: List[Dict[str, Any]], meta: Dict[str, Any]) -> bytes:
+    """Serialize a snapshot envelope holding ``meta`` alongside ``tasks``."""
+    return codec.dumps({**meta, 'tasks': tasks})
+
+
+def encode_snapshot_lines(tasks: List[Dict[str, Any]],
+                          meta: Dict[str, Any]) -> Tuple[bytes, array]:
+    """Serialize a snapshot as a ``meta`` header line followed by one line per task.
+
+    Also returns the snapshot's index: (id, byte offset) pairs of every
+    task line, sorted by id and flattened into one array.
+    """
+    header = codec.dumps(meta) + b'\n'
+    chunks = [header]
+    entries = []
+    offset = len(header)
+    for task in tasks:
+        line = codec.dumps(task) + b'\n'
+        entries.append((task['id'], offset))
+        chunks.append(line)
+        offset += len(line)
+    entries.sort()
+    index = array('q')
+    for entry in entries:
+        index.extend(entry)
+    return b''.join(chunks), index
+
+
+class MappedSnapshot:
+    """Read-only, memory-mapped view of a line-format snapshot.
+
+    Tasks are decoded one at a time, on access, by looking up their line
+    offset in the index; nothing else of the file is parsed.
+    """
+
+    def __init__(self, path: str, index: array):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.meta = codec.loads(self._map[:self._map.find(b'\n')])
+        self.ids = index[0::2]
+        self._offsets = index[1::2]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _position(self, task_id: int) -> int:
+        i = bisect_left(self.ids, task_id)
+        return i if i < len(self.ids) and self.ids[i] == task_id else -1
+
+    def __contains__(self, task_id: int) -> bool:
+        return self._position(task_id) >= 0
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Decode and return a task, or None if the snapshot lacks it."""
+        i = self._position(task_id)
+        if i < 0:
+            return None
+        start = self._offsets[i]
+        return codec.loads(self._map[start:self._map.find(b'\n', start)])
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers see either the old or new file.
+
+    The data is written to a temporary file in the same directory, fsynced
+    and renamed over ``path``; the directory is fsynced so the rename itself
+    survives a crash.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_file = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.")
+    try:
+        # mkstemp creates the file private; keep the permissions of the original
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_file, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class SnapshotWriter:
+    """Writes snapshot files atomically, keeping rotating backups on a schedule.
+
+    Before a snapshot is replaced, the previous one is kept as
+    ``<path>.backup`` if ``backup_interval`` seconds have passed since the
+    last backup; older backups move to ``<path>.backup.1`` and so on, up to
+    ``backup_count`` files. A ``backup_interval`` of None disables backups.
+    """
+
+    def __init__(self, path: str, backup_interval: Optional[float] = 3600.0,
+                 backup_count: int = 3):
+        self.path = path
+        self.backup_interval = backup_interval
+        self.backup_count = backup_count
+        self.backup_file = f"{path}.backup"
+        try:
+            self._last_backup = os.stat(self.backup_file).st_ctime
+        except FileNotFoundError:
+            self._last_backup = 0.0
+
+    def write(self, tasks: List[Dict[str, Any]], meta: Dict[str, Any]) -> None:
+        """Atomically replace the snapshot with ``tasks`` and ``meta``."""
+        self.write_data(encode_snapshot(tasks, meta))
+
+    def write_data(self, data: bytes) -> None:
+        """Atomically replace the snapshot with already encoded ``data``."""
+        self._maybe_backup()
+        atomic_write(self.path, data)
+
+    def _backup_name(self, n: int) -> str:
+        return self.backup_file if n == 0 else f"{self.backup_file}.{n}"
+
+    def _maybe_backup(self) -> None:
+        if (self.backup_interval is None or self.backup_count < 1
+                or not os.path.exists(self.path)
+                or time.time() - self._last_backup < self.backup_interval):
+            return
+
+        for n in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(self._backup_name(n - 1)):
+                os.replace(self._backup_name(n - 1), self._backup_name(n))
+        if os.path.exists(self.backup_file):
+            os.unlink(self.backup_file)
+        try:
+            # The snapshot is about to be replaced, so linking keeps the
+            # current version without copying it
+            os.link(self.path, self.backup_file)
+        except OSError:
+            shutil.copyfile(self.path, self.backup_file)
+        self._last_backup = time.time()
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return an (inode, mtime, size) stamp identifying a file's version."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class JSONFileStore(TaskStore):
+    """Rewrites the whole task list as one JSON document on every change."""
+
+    def __init__(self, data_file: str, backup_interval: Optional[float] = 3600.0,
+                 backup_count: int = 3):
+        self.data_file = data_file
+        self._writer = SnapshotWriter(data_file, backup_interval, backup_count)
+        self._file_lock = FileLock(f"{data_file}.lock")
+        self._stamp = None
+
+    def lock(self):
+        return self._file_lock
+
+    def load(self):
+        result = read_snapshot(self.data_file)
+        self._stamp = file_stamp(self.data_file)
+        return result
+
+    def has_changes(self) -> bool:
+        return file_stamp(self.data_file) != self._stamp
+
+    def read_changes(self):
+        return None if self.has_changes() else []
+
+    def write(self, records, snapshot) -> None:
+        self.compact(*snapshot())
+
+    def compact(self, tasks, meta) -> None:
+        self._writer.write(tasks, meta)
+        self._stamp = file_stamp(self.data_file)
+
+
+class AppendLogStore(TaskStore):
+    """Snapshot file plus an append-only log of change records.
+
+    Each mutation appends one JSON line to ``<data_file>.log``. Once the log
+    holds ``compact_threshold`` records it is folded into the snapshot,
+    which uses the same format as :class:`JSONFileStore`.
+    """
+
+    def __init__(self, data_file: str, compact_threshold: int = 1000,
+                 backup_interval: Optional[float] = 3600.0, backup_count: int = 3):
+        self.data_file = data_file
+        self.log_file = f"{data_file}.log"
+        self.compact_threshold = compact_threshold
+        self._writer = SnapshotWriter(data_file, backup_interval, backup_count)
+        self.log_records = 0
+        self._file_lock = FileLock(f"{data_file}.lock")
+        # How far this process has read: snapshot version and log byte offset
+        self._snapshot_stamp = None
+        self._log_offset = 0
+
+    def lock(self):
+        return self._file_lock
+
+    def load(self):
+        self._snapshot_stamp = file_stamp(self.data_file)
+        snapshot, meta = read_snapshot(self.data_file)
+        tasks = {task['id']: task for task in snapshot}
+        next_id = meta.get('next_id', 1)
+        self.log_records = 0
+        for record in self._read_log():
+            apply_record(tasks, record)
+            if record['op'] == 'add':
+                next_id = max(next_id, record['task']['id'] + 1)
+            self.log_records += 1
+        version = meta.get('version', 0) + self.log_records
+        return list(tasks.values()), {**meta, 'next_id': next_id, 'version': version}
+
+    def _read_log(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.log_file):
+            return []
+        records = []
+        committed = 0
+        with open(self.log_file, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                committed += len(line)
+                if line.strip():
+                    records.append(codec.loads(line))
+            torn = f.tell() != committed
+        if torn:
+            # Drop a record torn by a crash mid-append so later appends start
+            # on a clean line; the torn record never committed.
+            with open(self.log_file, 'r+b') as f:
+                f.truncate(committed)
+        self._log_offset = committed
+        return records
+
+    def _log_size(self) -> int:
+        try:
+            return os.path.getsize(self.log_file)
+        except FileNotFoundError:
+            return 0
+
+    def has_changes(self) -> bool:
+        return (file_stamp(self.data_file) != self._snapshot_stamp
+                or self._log_size() != self._log_offset)
+
+    def read_changes(self):
+        if file_stamp(self.data_file) != self._snapshot_stamp:
+            # Compacted by another process
+            return None
+        size = self._log_size()
+        if size < self._log_offset:
+            return None
+        if size == self._log_offset:
+            return []
+
+        with open(self.log_file, 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read(size - self._log_offset)
+        # Only consume complete lines; a record may still be mid-append
+        committed = data.rfind(b'\n') + 1
+        records = [codec.loads(line) for line in data[:committed].splitlines()
+                   if line.strip()]
+        self._log_offset += committed
+        self.log_records += len(records)
+        return records
+
+    def write(self, records, snapshot) -> None:
+        if not records:
+            return
+        lines = b''.join(codec.dumps(record) + b'\n' for record in records)
+        with open(self.log_file, 'ab') as f:
+            size_before = os.fstat(f.fileno()).st_size
+            f.write(lines)
+            f.flush()
+            size_after = os.fstat(f.fileno()).st_size
+        if size_before == self._log_offset:
+            # Nothing unread precedes our records, so skip past them. Otherwise
+            # they are re-read with the foreign ones, which replay tolerates.
+            self._log_offset = size_after
+        self.log_records += len(records)
+        if self.log_records >= self.compact_threshold:
+            self.compact(*snapshot())
+
+    def compact(self, tasks, meta) -> None:
+        self._write_snapshot(tasks, meta)
+        # A crash before truncation only means the log is replayed over a
+        # snapshot that already contains it, which apply_record tolerates.
+        with open(self.log_file, 'w'):
+            pass
+        self.log_records = 0
+        self._snapshot_stamp = file_stamp(self.data_file)
+        self._log_offset = 0
+
+    def _write_snapshot(self, tasks: List[Dict[str, Any]], meta: Dict[str, Any]) -> None:
+        self._writer.write(tasks, meta)
+
+
+# First word of a snapshot index file
+INDEX_MAGIC = 0x7473_6b69_6478_0001
+
+
+class IndexedLogStore(AppendLogStore):
+    """Append-log store whose snapshot can be opened without parsing it.
+
+    The snapshot holds a metadata header line followed by one task per
+    line, and ``<data_file>.idx`` maps every task id to the offset of its
+    line. load_lazy() memory-maps the snapshot and reads only the index and
+    the log, so looking up a few tasks costs little however large the store
+    is. The index records the (inode, mtime, size) stamp of the snapshot it
+    describes; if it is missing or stale, or the snapshot is still in the
+    single-document format, the next lazy load reads everything once and
+    rewrites both files.
+    """
+
+    def __init__(self, data_file: str, **kwargs):
+        super().__init__(data_file, **kwargs)
+        self.index_file = f"{data_file}.idx"
+
+    def _write_snapshot(self, tasks, meta) -> None:
+        data, index = encode_snapshot_lines(tasks, meta)
+        self._writer.write_data(data)
+        header = array('q', [INDEX_MAGIC, *self._index_stamp()])
+        atomic_write(self.index_file, header.tobytes() + index.tobytes())
+
+    def _index_stamp(self) -> Tuple[int, int, int]:
+        ino, mtime, size = file_stamp(self.data_file)
+        # Fit the inode number in a signed 64-bit slot
+        return ino & (2 ** 63 - 1), mtime, size
+
+    def _read_index(self) -> Optional[array]:
+        """Return the (id, offset) pairs if the index matches the snapshot."""
+        try:
+            with open(self.index_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        index = array('q')
+        if len(data) % index.itemsize or len(data) < 4 * index.itemsize:
+            return None
+        index.frombytes(data)
+        if (index[0] != INDEX_MAGIC or file_stamp(self.data_file) is None
+                or tuple(index[1:4]) != self._index_stamp()):
+            return None
+        return index[4:]
+
+    def load_lazy(self):
+        if file_stamp(self.data_file) is None:
+            # Nothing compacted yet; the log alone is cheap to read in full
+            return None
+        index = self._read_index()
+        if index is None:
+            self.compact(*self.load())
+            index = self._read_index()
+
+        self._snapshot_stamp = file_stamp(self.data_file)
+        snapshot = MappedSnapshot(self.data_file, index)
+        records = self._read_log()
+        self.log_records = len(records)
+        meta = snapshot.meta
+        next_id = meta.get('next_id', 1)
+        for record in records:
+            if record['op'] == 'add':
+                next_id = max(next_id, record['task']['id'] + 1)
+        version = meta.get('version', 0) + self.log_records
+        return snapshot, records, {**meta, 'next_id': next_id, 'version': version}
+
+
+TASK_COLUMNS = ('id', 'description', 'priority', 'category', 'status',
+                'created_at', 'completed_at')
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteTaskStore(TaskStore):
+    """Stores tasks in an indexed SQLite table.
+
+    Filtered listings and statistics are answered with SQL against the
+    status, category (case-insensitive), priority and created_at indexes.
+    Category matching uses SQLite's NOCASE collation, which folds ASCII only.
+    """
+
+    queryable = True
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SQLITE_SCHEMA)
+        self._file_lock = FileLock(f"{db_file}.lock")
+        self._data_version = None
+
+    def lock(self):
+        return self._file_lock
+
+    def _current_data_version(self) -> int:
+        # Changes whenever another connection commits to the database
+        with self._lock:
+            return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def has_changes(self) -> bool:
+        return self._current_data_version() != self._data_version
+
+    def read_changes(self):
+        return None if self.has_changes() else []
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _rows(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def is_empty(self) -> bool:
+        """Return True if the database holds no tasks."""
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM tasks LIMIT 1').fetchone() is None
+
+    def load(self):
+        self._data_version = self._current_data_version()
+        tasks = self._rows('SELECT * FROM tasks ORDER BY id')
+        meta = dict(self._rows_raw('SELECT key, value FROM meta'))
+        return tasks, meta
+
+    def _rows_raw(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _set_next_id(self, next_id: int) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('next_id', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+            (next_id,))
+
+    def _bump_version(self, count: int) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+            (count,))
+
+    def write(self, records, snapshot) -> None:
+        with self._lock, self._conn:
+            for record in records:
+                self._apply(record)
+            self._bump_version(len(records))
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        op = record.get('op')
+        if op == 'add':
+            task = record['task']
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO tasks ({', '.join(TASK_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(TASK_COLUMNS))})",
+                tuple(task.get(column) for column in TASK_COLUMNS))
+            self._set_next_id(task['id'] + 1)
+        elif op == 'update':
+            changes = {k: v for k, v in record['changes'].items() if k in TASK_COLUMNS}
+            if changes:
+                assignments = ', '.join(f"{column} = ?" for column in changes)
+                self._conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?",
+                                   (*changes.values(), record['id']))
+        elif op == 'delete':
+            self._conn.executemany('DELETE FROM tasks WHERE id = ?',
+                                   [(task_id,) for task_id in record['ids']])
+        else:
+            raise ValueError(f"Unknown change record: {op!r}")
+
+    def compact(self, tasks, meta) -> None:
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM tasks')
+            for task in tasks:
+                self._apply({'op': 'add', 'task': task})
+            if 'next_id' in meta:
+                self._set_next_id(meta['next_id'])
+            if 'version' in meta:
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('version', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+                    (meta['version'],))
+
+    def import_json(self, json_file: str) -> int:
+        """Import tasks from a JSON snapshot (and its change log, if any).
+
+        Existing rows are replaced. Returns the number of imported tasks.
+        """
+        tasks, meta = AppendLogStore(json_file).load()
+        self.compact(tasks, meta)
+        return len(tasks)
+
+    def migrate_json(self, json_file: str) -> Optional[int]:
+        """Import a JSON store once, the first time SQLite is used in its place.
+
+        The snapshot or its change log alone is enough to count as a JSON
+        store. The migration is recorded in the meta table, so it never runs
+        again (not even once every task has been deleted), and a database
+        that already holds tasks is never overwritten. Returns the number of
+        imported tasks, or None if nothing was imported.
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'migrated'").fetchone() is not None
+        count = None
+        if not done and self.is_empty() and (
+                os.path.exists(json_file) or os.path.exists(f"{json_file}.log")):
+            count = self.import_json(json_file)
+        if not done:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated', 1)")
+        return count
+
+    @staticmethod
+    def _where(status: str, category: Optional[str], priority: Optional[str],
+               after: Optional[Tuple] = None) -> Tuple[str, Tuple]:
+        clauses, params = [], []
+        if after is not None:
+            # Keyset pagination on the listing order
+            clauses.append("(status = 'completed', created_at, id) > (?, ?, ?)")
+            params.extend(after)
+        if status != 'all':
+            clauses.append('status = ?')
+            params.append(status)
+        if category:
+            clauses.append('category = ? COLLATE NOCASE')
+            params.append(category)
+        if priority:
+            clauses.append('priority = ?')
+            params.append(priority)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where, tuple(params)
+
+    def query_tasks(self, status: str = 'all', category: Optional[str] = None,
+                    priority: Optional[str] = None, after: Optional[Tuple] = None,
+                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return filtered tasks, pending first, then by creation time.
+
+        ``after`` is an order key (completed, created_at, id) to resume from.
+        """
+        where, params = self._where(status, category, priority, after)
+        sql = (f"SELECT * FROM tasks {where} "
+               f"ORDER BY status = 'completed', created_at, id")
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        return self._rows(sql, params)
+
+    def count_tasks(self) -> Tuple[int, int, Dict[str, int], Dict[str, int]]:
+        """Return (total, pending, by_priority, by_category) counts."""
+        with self._lock:
+            total, pending = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status = 'pending'), 0) FROM tasks").fetchone()
+            by_priority = dict(self._conn.execute(
+                'SELECT priority, COUNT(*) FROM tasks GROUP BY priority').fetchall())
+            by_category = dict(self._conn.execute(
+                'SELECT category, COUNT(*) FROM tasks GROUP BY category '
+                'ORDER BY MIN(id)').fetchall())
+        return total, pending, by_priority, by_category
@@ -0,0 +1,104 @@
+"""
+Compact in-memory task record.
+"""
+
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Union
+
+FIELDS = ('id', 'description', 'priority', 'category', 'status',
+          'created_at', 'completed_at')
+
+_FIELD_SET = frozenset(FIELDS)
+_TIME_FIELDS = frozenset(('created_at', 'completed_at'))
+_INTERNED_FIELDS = frozenset(('priority', 'category', 'status'))
+
+
+def _parse_time(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, passing datetimes and None through."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class Task(Mapping):
+    """A single task, stored in slots rather than a per-task dict.
+
+    Status, priority and category strings are interned so all tasks share
+    one copy of each value, and timestamps are kept as datetimes. Read as a
+    mapping, a Task looks exactly like its serialized dict (timestamps as
+    ISO 8601 strings), so ``task['status']`` and comparisons with dicts
+    keep working; code inside the manager uses the attributes directly.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, id: int, description: str, priority: str, category: str,
+                 status: str, created_at: Union[str, datetime],
+                 completed_at: Union[str, datetime, None] = None):
+        self.id = id
+        self.description = description
+        self.priority = sys.intern(priority)
+        self.category = sys.intern(category)
+        self.status = sys.intern(status)
+        self.created_at = _parse_time(created_at)
+        self.completed_at = _parse_time(completed_at)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Task':
+        """Build a task from its serialized dict form."""
+        return cls(data['id'], data['description'], data['priority'], data['category'],
+                   data['status'], data['created_at'], data.get('completed_at'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the serialized dict form used by storage and the API."""
+        return {
+            'id': self.id,
+            'description': self.description,
+            'priority': self.priority,
+            'category': self.category,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'completed_at': _format_time(self.completed_at)
+        }
+
+    def update(self, changes: Dict[str, Any]) -> None:
+        """Apply field changes given in serialized form."""
+        for field, value in changes.items():
+            if field in _TIME_FIELDS:
+                value = _parse_time(value)
+            elif field in _INTERNED_FIELDS:
+                value = sys.intern(value)
+            elif field not in _FIELD_SET:
+                continue
+            setattr(self, field, value)
+
+    def copy(self) -> 'Task':
+        """Return an independent copy of the task."""
+        return Task(self.id, self.description, self.priority, self.category,
+                    self.status, self.created_at, self.completed_at)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return _format_time(value) if key in _TIME_FIELDS else value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        self.update({key: value})
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()!r})"
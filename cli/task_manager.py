@@ -2,150 +2,1243 @@
 Task Manager module for handling task operations and JSON storage.
 """
 
+import base64
+import heapq
 import json
-import os
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import (List, Dict, Callable, Iterable, Iterator, Optional, Any, Set,
+                    Tuple)
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: the columnar task table falls back to pure Python scans
+    np = None
+
+try:
+    from .display import display_statistics, display_tasks, priority_symbol
+    from .locking import ReadWriteLock
+    from .storage import (TASK_COLUMNS, AppendLogStore, IndexedLogStore, MappedSnapshot,
+                          TaskStore, apply_record)
+    from .task import Task
+except ImportError:
+    # Imported as a top-level module from within cli/
+    from display import display_statistics, display_tasks, priority_symbol
+    from locking import ReadWriteLock
+    from storage import (TASK_COLUMNS, AppendLogStore, IndexedLogStore, MappedSnapshot,
+                         TaskStore, apply_record)
+    from task import Task
+
+
+def _order_key(task: Task) -> Tuple[bool, datetime, int]:
+    """Listing sort key: pending first, then by created date."""
+    return (task.status == 'completed', task.created_at, task.id)
+
+
+def _encode_cursor(task: Task) -> str:
+    """Encode the listing position of ``task`` as an opaque cursor."""
+    done, created_at, task_id = _order_key(task)
+    raw = json.dumps([int(done), created_at.isoformat(), task_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, datetime, int]:
+    """Decode a cursor produced by :func:`_encode_cursor`."""
+    try:
+        done, created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (int(done), datetime.fromisoformat(created_at), int(task_id))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Epoch value stored for a missing timestamp (e.g. an open task's completed_at)
+_NO_TIME = -2 ** 63
+
+
+def _epoch_us(value: Optional[datetime]) -> int:
+    """Convert a naive datetime to microseconds since the epoch."""
+    return (value - _EPOCH) // _MICROSECOND if value is not None else _NO_TIME
+
+
+class TaskTable:
+    """Columnar copy of the task set for vectorized filtering and statistics.
+    
+    Each field is a typed ``array`` column: ids, status/priority/category
+    codes into per-field value pools, and created/completed times as epoch
+    microseconds. Descriptions live in a separate string pool. With NumPy
+    installed the columns are scanned through zero-copy ndarray views,
+    otherwise with plain Python loops. Rows are unordered: removing a row
+    moves the last row into its place.
+    """
+    
+    CODED_FIELDS = ('status', 'priority', 'category')
+    
+    def __init__(self):
+        self.ids = array('q')
+        self.codes = {field: array('i') for field in self.CODED_FIELDS}
+        self.created = array('q')
+        self.completed = array('q')
+        self.descriptions: List[str] = []
+        # Per coded field: code -> value, and value -> code
+        self._values: Dict[str, List[str]] = {field: [] for field in self.CODED_FIELDS}
+        self._code_of: Dict[str, Dict[str, int]] = {field: {} for field in self.CODED_FIELDS}
+        self._rows: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def _code(self, field: str, value: str) -> int:
+        """Return the code for ``value``, adding it to the field's pool if new."""
+        code = self._code_of[field].get(value)
+        if code is None:
+            code = self._code_of[field][value] = len(self._values[field])
+            self._values[field].append(value)
+        return code
+    
+    def _columns(self):
+        return (self.ids, *self.codes.values(), self.created, self.completed,
+                self.descriptions)
+    
+    def put(self, task: Task) -> None:
+        """Insert a task, or overwrite its row if it is already present."""
+        values = (task.id, *(self._code(field, getattr(task, field))
+                             for field in self.CODED_FIELDS),
+                  _epoch_us(task.created_at), _epoch_us(task.completed_at),
+                  task.description)
+        row = self._rows.get(task.id)
+        if row is None:
+            self._rows[task.id] = len(self.ids)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+    
+    def remove(self, task_id: int) -> None:
+        """Remove a task's row."""
+        row = self._rows.pop(task_id)
+        last = len(self.ids) - 1
+        for column in self._columns():
+            value = column.pop()
+            if row != last:
+                column[row] = value
+        if row != last:
+            self._rows[self.ids[row]] = row
+    
+    def _matching_codes(self, status: str, category: Optional[str],
+                        priority: Optional[str]) -> List[Tuple[str, List[int]]]:
+        """Translate filters into (field, accepted codes) pairs."""
+        filters = []
+        if status != 'all':
+            filters.append(('status', [self._code_of['status'][status]]
+                            if status in self._code_of['status'] else []))
+        if category:
+            category = category.lower()
+            filters.append(('category', [code for code, value in
+                                         enumerate(self._values['category'])
+                                         if value.lower() == category]))
+        if priority:
+            filters.append(('priority', [self._code_of['priority'][priority]]
+                            if priority in self._code_of['priority'] else []))
+        return filters
+    
+    def select(self, status: str = 'all', category: Optional[str] = None,
+               priority: Optional[str] = None, after: Optional[Tuple] = None,
+               limit: Optional[int] = None) -> List[int]:
+        """Return the ids of matching tasks, pending first, then by created date.
+        
+        With ``after`` set to an order key only tasks sorting after it are
+        returned, and at most ``limit`` of them.
+        """
+        if not self.ids:
+            return []
+        filters = self._matching_codes(status, category, priority)
+        completed = self._code_of['status'].get('completed', -1)
+        if after is not None:
+            after = (int(after[0]), _epoch_us(after[1]), after[2])
+        
+        if np is not None:
+            mask = np.ones(len(self.ids), dtype=bool)
+            for field, codes in filters:
+                mask &= np.isin(np.frombuffer(self.codes[field], dtype=np.int32), codes)
+            ids = np.frombuffer(self.ids, dtype=np.int64)
+            created = np.frombuffer(self.created, dtype=np.int64)
+            done = np.frombuffer(self.codes['status'], dtype=np.int32) == completed
+            if after is not None:
+                a_done, a_created, a_id = after
+                mask &= (done > a_done) | ((done == a_done) & (
+                    (created > a_created) | ((created == a_created) & (ids > a_id))))
+            rows = np.flatnonzero(mask)
+            if limit is not None and limit < len(rows):
+                # Keep the rows whose (done, created) key is within the first
+                # ``limit`` (ties included) before sorting
+                key = np.where(done[rows], created[rows] + 2 ** 62, created[rows])
+                cutoff = np.partition(key, limit - 1)[limit - 1]
+                rows = rows[key <= cutoff]
+            rows = rows[np.lexsort((ids[rows], created[rows], done[rows]))]
+            return ids[rows[:limit]].tolist()
+        
+        accepted = [(self.codes[field], set(codes)) for field, codes in filters]
+        status_codes, created = self.codes['status'], self.created
+        order_key = lambda row: (status_codes[row] == completed, created[row], self.ids[row])
+        rows = [row for row in range(len(self.ids))
+                if all(column[row] in codes for column, codes in accepted)
+                and (after is None or order_key(row) > after)]
+        if limit is not None:
+            rows = heapq.nsmallest(limit, rows, key=order_key)
+        else:
+            rows.sort(key=order_key)
+        return [self.ids[row] for row in rows]
+    
+    def _tally(self, field: str) -> Dict[str, int]:
+        """Count rows per value of a coded field."""
+        values = self._values[field]
+        if np is not None and self.ids:
+            counts = np.bincount(np.frombuffer(self.codes[field], dtype=np.int32),
+                                 minlength=len(values))
+            return {values[code]: int(count) for code, count in enumerate(counts) if count}
+        counts = Counter(self.codes[field])
+        return {values[code]: counts[code] for code in range(len(values)) if counts[code]}
+    
+    def counts(self) -> Tuple[int, int, Dict[str, int], Dict[str, int]]:
+        """Return (total, pending, by_priority, by_category) counts."""
+        return (len(self.ids), self._tally('status').get('pending', 0),
+                self._tally('priority'), self._tally('category'))
+
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded words for searching."""
+    return _WORD.findall(text.casefold())
+
+
+class SearchIndex:
+    """Inverted index over task descriptions for ranked full-text search.
+    
+    Each word maps to the ids of the tasks containing it, with the word's
+    frequency in the task normalized by description length. The vocabulary
+    is also kept sorted, so every word starting with a query prefix is
+    found by bisection. Tasks are upserted and removed one at a time;
+    re-putting an unchanged description is free.
+    """
+    
+    # Shorter query words only match whole words
+    MIN_PREFIX = 3
+    
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []
+        self._docs: Dict[int, str] = {}
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    def put(self, task_id: int, description: str) -> None:
+        """Index a task's description, replacing any previous one."""
+        previous = self._docs.get(task_id)
+        if previous is not None:
+            if previous == description:
+                return
+            self.remove(task_id)
+        words = tokenize(description)
+        # Short, focused descriptions rank above long ones mentioning a word
+        norm = math.sqrt(len(words) or 1)
+        for term, count in Counter(words).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[task_id] = count / norm
+        self._docs[task_id] = description
+    
+    def remove(self, task_id: int) -> None:
+        """Remove a task from the index if present."""
+        description = self._docs.pop(task_id, None)
+        if description is None:
+            return
+        for term in set(tokenize(description)):
+            postings = self._postings[term]
+            del postings[task_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+    
+    def _expand(self, word: str) -> List[Tuple[str, float]]:
+        """Return (term, weight) pairs for the vocabulary terms matching ``word``.
+        
+        An exact match weighs 1; a term merely starting with ``word`` weighs
+        the fraction of it that was typed.
+        """
+        matches = [(word, 1.0)] if word in self._postings else []
+        if len(word) >= self.MIN_PREFIX:
+            i = bisect_right(self._terms, word)
+            while i < len(self._terms) and self._terms[i].startswith(word):
+                matches.append((self._terms[i], len(word) / len(self._terms[i])))
+                i += 1
+        return matches
+    
+    def _idf(self, term: str) -> float:
+        """Inverse document frequency: rarer terms count for more."""
+        return math.log(1 + len(self._docs) / len(self._postings[term]))
+    
+    def search(self, query: str, candidates: Optional[Set[int]] = None) -> Dict[int, float]:
+        """Score the tasks (optionally among ``candidates``) matching every query word.
+        
+        A task scores, per query word, the best tf-idf of its terms matching
+        that word, summed over the words.
+        """
+        scores = None if candidates is None else dict.fromkeys(candidates, 0.0)
+        matches = [self._expand(word) for word in dict.fromkeys(tokenize(query))]
+        # Start from the most selective word to keep the running set small
+        matches.sort(key=lambda terms: sum(len(self._postings[t]) for t, _ in terms))
+        for terms in matches:
+            if not terms or scores == {}:
+                return {}
+            weighted = [(self._postings[term], weight * self._idf(term))
+                        for term, weight in terms]
+            size = sum(len(postings) for postings, _ in weighted)
+            word_scores: Dict[int, float] = {}
+            if scores is not None and len(scores) < size:
+                # Few tasks left: probe the postings for each of them
+                for task_id, score in scores.items():
+                    best = max(weight * postings.get(task_id, 0) for postings, weight in weighted)
+                    if best:
+                        word_scores[task_id] = score + best
+            else:
+                for postings, weight in weighted:
+                    for task_id, tf in postings.items():
+                        if tf * weight > word_scores.get(task_id, 0.0):
+                            word_scores[task_id] = tf * weight
+                if scores is not None:
+                    word_scores = {task_id: scores[task_id] + score
+                                   for task_id, score in word_scores.items() if task_id in scores}
+            scores = word_scores
+        return scores or {}
+
+
+class LazyTaskIndex(MutableMapping):
+    """Primary task index over a memory-mapped snapshot.
+    
+    Tasks are decoded from the snapshot the first time they are looked up
+    and kept from then on; tasks added, replaced or deleted since the
+    snapshot was written live in memory only. Iteration yields the
+    snapshot's tasks in id order, then newer ones in insertion order.
+    """
+    
+    def __init__(self, snapshot: MappedSnapshot):
+        self._snapshot = snapshot
+        self._loaded: Dict[int, Task] = {}
+        # Snapshot tasks that were deleted, and ids the snapshot lacks
+        self._deleted: Set[int] = set()
+        self._added: Dict[int, None] = {}
+    
+    def __getitem__(self, task_id: int) -> Task:
+        task = self._loaded.get(task_id)
+        if task is None:
+            if task_id in self._deleted:
+                raise KeyError(task_id)
+            data = self._snapshot.get(task_id)
+            if data is None:
+                raise KeyError(task_id)
+            task = self._loaded[task_id] = Task.from_dict(data)
+        return task
+    
+    def __setitem__(self, task_id: int, task: Task) -> None:
+        if task_id in self._deleted:
+            self._deleted.discard(task_id)
+        elif task_id not in self._loaded and task_id not in self._snapshot:
+            self._added[task_id] = None
+        self._loaded[task_id] = task
+    
+    def __delitem__(self, task_id: int) -> None:
+        if task_id not in self:
+            raise KeyError(task_id)
+        self._loaded.pop(task_id, None)
+        if task_id in self._added:
+            del self._added[task_id]
+        else:
+            self._deleted.add(task_id)
+    
+    def __contains__(self, task_id: object) -> bool:
+        if task_id in self._loaded:
+            return True
+        return task_id not in self._deleted and task_id in self._snapshot
+    
+    def __iter__(self) -> Iterator[int]:
+        deleted = self._deleted
+        for task_id in self._snapshot.ids:
+            if task_id not in deleted:
+                yield task_id
+        yield from list(self._added)
+    
+    def __len__(self) -> int:
+        return len(self._snapshot) - len(self._deleted) + len(self._added)
+
+
+def _check_fields(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Validate a field projection against the task columns."""
+    if fields is None:
+        return None
+    fields = list(fields)
+    unknown = [f for f in fields if f not in TASK_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown task field(s): {', '.join(unknown)}")
+    return fields
 
 
 class TaskManager:
-    """Manages tasks with JSON file storage."""
+    """Manages tasks with pluggable (by default append-log JSON) storage."""
     
-    def __init__(self, data_file: str = 'tasks.json'):
-        """Initialize the TaskManager with a data file."""
+    def __init__(self, data_file: str = 'tasks.json',
+                 store: Optional[TaskStore] = None, durability: str = 'sync',
+                 flush_interval: float = 1.0, flush_threshold: int = 100,
+                 columnar: bool = False, lazy: bool = False):
+        """Initialize the TaskManager with a data file or storage backend.
+        
+        ``durability`` is ``'sync'`` to persist every mutation before it
+        returns, or ``'batched'`` to apply mutations in memory and have a
+        background thread persist them every ``flush_interval`` seconds or
+        once ``flush_threshold`` changes are pending (group commit).
+        
+        The manager is safe to share between threads. Under ``'sync'``
+        durability it also coordinates with other processes using the same
+        store: mutations run under the store's file lock after catching up
+        with changes made elsewhere, and reads pick those changes up too.
+        ``'batched'`` durability assumes a single process owns the store.
+        
+        With ``columnar`` set a :class:`TaskTable` is kept alongside the
+        indexes, and filtered listings and statistics are computed from its
+        columns (vectorized when NumPy is installed).
+        
+        With ``lazy`` set (and by default an :class:`IndexedLogStore`)
+        tasks are decoded from the memory-mapped snapshot only when they
+        are accessed, and the secondary indexes are built by the first
+        listing, search or statistics call, so a short-lived process that
+        touches a few tasks never reads the rest.
+        """
+        if durability not in ('sync', 'batched'):
+            raise ValueError(f"Unknown durability policy: {durability}")
+        
         self.data_file = data_file
-        self.tasks = self._load_tasks()
+        if store is None:
+            store = IndexedLogStore(data_file) if lazy else AppendLogStore(data_file)
+        self.store = store
+        self.lazy = lazy
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        # Readers share in-memory state; mutations and reloads are exclusive
+        self._rw = ReadWriteLock()
+        # Group commit: records awaiting a flush, and the lock ordering writes
+        self._pending_records: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = False
+        # Change listeners; replaced rather than mutated so publishing needs no lock
+        self._listeners: Tuple[Callable[[Dict[str, Any]], None], ...] = ()
+        self._listeners_lock = threading.Lock()
+        # Primary index: id -> task, kept in insertion order
+        self._index: Dict[int, Task] = {}
+        # Secondary indexes: status / lowercased category / priority -> ids
+        self._by_status: Dict[str, Set[int]] = {}
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_priority: Dict[str, Set[int]] = {}
+        # Running count per exact (case-sensitive) category for statistics
+        self._category_counts: Dict[str, int] = {}
+        # Listing order: (created_at, id) keys of open and completed tasks,
+        # indexed by ``status == 'completed'`` and kept sorted on mutation
+        self._order: Tuple[List[Tuple[datetime, int]], List[Tuple[datetime, int]]] = ([], [])
+        # Whether the derived indexes below reflect the primary index; in
+        # lazy mode they are built on first use
+        self._indexed = False
+        # Optional columnar copy of all tasks for reporting-scale scans
+        self._table: Optional[TaskTable] = TaskTable() if columnar else None
+        # Full-text index over descriptions, built by the first search
+        self._search: Optional[SearchIndex] = None
+        self._next_id = 1
+        # Data version: the number of change records ever written to the store
+        self._version = 0
+        self._load_tasks()
+        
+        self._flusher = None
+        if durability == 'batched':
+            self._flusher = threading.Thread(target=self._flush_loop,
+                                             name='task-flusher', daemon=True)
+            self._flusher.start()
     
-    def _load_tasks(self) -> List[Dict[str, Any]]:
-        """Load tasks from JSON file."""
-        if not os.path.exists(self.data_file):
-            return []
+    def __enter__(self) -> 'TaskManager':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks in insertion order."""
+        self._refresh()
+        with self._rw.read():
+            return list(self._index.values())
+    
+    @property
+    def version(self) -> int:
+        """Data version, increased by every change and persisted by the store.
         
+        Managers sharing a store agree on the version of the same data, so
+        it can serve as a cache validator (e.g. an HTTP ETag).
+        """
+        self._refresh()
+        with self._rw.read():
+            return self._version
+    
+    def _changed(self, count: int = 1) -> None:
+        """Advance the data version by ``count`` change records."""
+        self._version += count
+    
+    def _load_tasks(self) -> None:
+        """Load tasks from the storage backend."""
         try:
-            with open(self.data_file, 'r') as f:
-                content = f.read()
-                if not content:
-                    return []
-                return json.loads(content)
+            with self.store.lock():
+                loaded = self.store.load_lazy() if self.lazy else None
+                if loaded is None:
+                    tasks, meta = self.store.load()
+                    index = {task['id']: Task.from_dict(task) for task in tasks}
+                else:
+                    snapshot, records, meta = loaded
+                    index = LazyTaskIndex(snapshot)
+                    for record in records:
+                        apply_record(index, record, Task.from_dict)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Could not load tasks file: {e}")
-            return []
+            index, meta = {}, {}
+        
+        self._index = index
+        self._next_id = max(meta.get('next_id', 1), max(self._index, default=0) + 1)
+        self._version = max(self._version, meta.get('version', 0))
+        if self.lazy:
+            self._indexed = False
+        else:
+            self._rebuild_indexes()
     
-    def _save_tasks(self) -> bool:
-        """Save tasks to JSON file."""
-        try:
-            # Create backup of existing file
-            if os.path.exists(self.data_file):
-                backup_file = f"{self.data_file}.backup"
-                with open(self.data_file, 'r') as src, open(backup_file, 'w') as dst:
-                    dst.write(src.read())
-            
-            # Write new data
-            with open(self.data_file, 'w') as f:
-                json.dump(self.tasks, f, indent=2, default=str)
+    @property
+    def _store_answers_queries(self) -> bool:
+        """Whether listings and statistics come from the store's own queries.
+        
+        Only under sync durability: batched changes reach the store later,
+        while the in-memory indexes are always current.
+        """
+        return self.store.queryable and self.durability == 'sync'
+    
+    def _ensure_indexes(self, for_query: bool = False) -> None:
+        """Build the secondary indexes if they were deferred (lazy mode).
+        
+        With ``for_query`` set, stores that answer listings and statistics
+        themselves (SQLite) skip the build.
+        """
+        if self._indexed or (for_query and self._store_answers_queries):
+            return
+        with self._rw.write():
+            if not self._indexed:
+                self._rebuild_indexes()
+    
+    def _sync(self) -> None:
+        """Catch up with changes other processes made to the store.
+        
+        The caller must hold the write lock.
+        """
+        records = self.store.read_changes()
+        if records is None:
+            self._load_tasks()
+            self._notify({'type': 'reload', 'version': self._version})
+            return
+        for record in records:
+            self._replay(record)
+        self._publish(records)
+    
+    def _refresh(self) -> None:
+        """Pick up changes from other processes before serving a read."""
+        if self.durability == 'sync' and self.store.has_changes():
+            with self._rw.write():
+                self._sync()
+    
+    @contextmanager
+    def _mutation(self):
+        """Hold the state exclusively for a mutation.
+        
+        Under sync durability the store's process lock is held as well and
+        in-memory state is caught up first, so IDs never collide across
+        processes and no update is lost.
+        """
+        with self._rw.write():
+            if self.durability == 'sync':
+                with self.store.lock():
+                    self._sync()
+                    yield
+            else:
+                yield
+    
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> Callable[[], None]:
+        """Call ``listener`` with an event for every change; returns an unsubscribe function.
+        
+        Events are small deltas carrying the data ``version`` they produced:
+        ``created``, ``updated`` and ``completed`` hold the task's new
+        record under ``task``, ``deleted`` holds the removed ``ids``, and
+        ``reload`` means the data was replaced wholesale (e.g. after another
+        process compacted the store) and should be fetched again. Changes
+        made by other processes are published once this manager picks them
+        up. Listeners run with the write lock held, so they must return
+        quickly and must not call back into the manager.
+        """
+        with self._listeners_lock:
+            self._listeners += (listener,)
+        
+        def unsubscribe() -> None:
+            with self._listeners_lock:
+                self._listeners = tuple(l for l in self._listeners if l is not listener)
+        return unsubscribe
+    
+    def _notify(self, event: Dict[str, Any]) -> None:
+        """Deliver an event to every listener."""
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Warning: change listener failed: {e}")
+    
+    def _publish(self, records: List[Dict[str, Any]]) -> None:
+        """Publish events for change records that were just applied."""
+        if not self._listeners:
+            return
+        version = self._version - len(records)
+        for record in records:
+            version += 1
+            op = record['op']
+            if op == 'add':
+                event = {'type': 'created', 'task': record['task']}
+            elif op == 'update':
+                task = self._index.get(record['id'])
+                if task is None:
+                    # Deleted later in the same batch; its delete event follows
+                    continue
+                completed = record['changes'].get('status') == 'completed'
+                event = {'type': 'completed' if completed else 'updated',
+                         'task': task.to_dict()}
+            else:
+                event = {'type': 'deleted', 'ids': record['ids']}
+            event['version'] = version
+            self._notify(event)
+    
+    def _replay(self, record: Dict[str, Any]) -> None:
+        """Apply a change record written by another process to memory."""
+        self._changed()
+        op = record['op']
+        if op == 'add':
+            task = Task.from_dict(record['task'])
+            existing = self._index.get(task.id)
+            if existing is not None:
+                self._unindex_task(existing)
+            self._index[task.id] = task
+            self._index_task(task)
+            self._next_id = max(self._next_id, task.id + 1)
+        elif op == 'update':
+            task = self._index.get(record['id'])
+            if task is not None:
+                self._apply_update(task, record['changes'])
+        elif op == 'delete':
+            self._apply_delete([i for i in record['ids'] if i in self._index])
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the secondary indexes and statistics from the primary index."""
+        self._indexed = True
+        self._by_status, self._by_category, self._by_priority = {}, {}, {}
+        self._category_counts = {}
+        self._order = ([], [])
+        if self._table is not None:
+            self._table = TaskTable()
+        if self._search is not None:
+            self._search = SearchIndex()
+        for task in self._index.values():
+            self._index_task(task, ordered=False)
+        for keys in self._order:
+            keys.sort()
+    
+    def _secondary_keys(self, task: Task):
+        """Yield (index, key) pairs under which a task is indexed."""
+        yield self._by_status, task.status
+        yield self._by_category, task.category.lower()
+        yield self._by_priority, task.priority
+    
+    def _index_task(self, task: Task, ordered: bool = True) -> None:
+        """Add a task to the secondary indexes and running statistics.
+        
+        With ``ordered`` unset the task's order key is appended unsorted;
+        the caller is then responsible for re-sorting the order lists.
+        """
+        if not self._indexed:
+            return
+        for index, key in self._secondary_keys(task):
+            index.setdefault(key, set()).add(task.id)
+        category = task.category
+        self._category_counts[category] = self._category_counts.get(category, 0) + 1
+        keys = self._order[task.status == 'completed']
+        if ordered:
+            insort(keys, (task.created_at, task.id))
+        else:
+            keys.append((task.created_at, task.id))
+        if self._table is not None:
+            self._table.put(task)
+        # Upserted rather than removed by _unindex_task, so updates that
+        # keep the description skip re-tokenizing it
+        if self._search is not None:
+            self._search.put(task.id, task.description)
+    
+    def _unindex_task(self, task: Task) -> None:
+        """Remove a task from the secondary indexes and running statistics."""
+        if not self._indexed:
+            return
+        for index, key in self._secondary_keys(task):
+            ids = index[key]
+            ids.discard(task.id)
+            if not ids:
+                del index[key]
+        category = task.category
+        self._category_counts[category] -= 1
+        if not self._category_counts[category]:
+            del self._category_counts[category]
+        keys = self._order[task.status == 'completed']
+        del keys[bisect_left(keys, (task.created_at, task.id))]
+        if self._table is not None:
+            self._table.remove(task.id)
+    
+    def _filter_ids(self, status: str = 'all', category: Optional[str] = None,
+                    priority: Optional[str] = None) -> Optional[Set[int]]:
+        """Return the ids matching the filters, or None when unfiltered."""
+        # Intersect the matching index entries, smallest first
+        candidates = []
+        if status != 'all':
+            candidates.append(self._by_status.get(status, set()))
+        if category:
+            candidates.append(self._by_category.get(category.lower(), set()))
+        if priority:
+            candidates.append(self._by_priority.get(priority, set()))
+        
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        return set.intersection(*candidates)
+    
+    def _iter_ordered(self, ids: Optional[Set[int]] = None,
+                      after: Optional[Tuple] = None) -> Iterator[Task]:
+        """Yield tasks (optionally only ``ids``) pending first, then by created date.
+        
+        With ``after`` set to an order key, only tasks sorting after it are yielded.
+        """
+        if ids is not None and len(ids) * 16 < len(self._index):
+            # Few matches: ordering them directly beats walking the full order
+            tasks = [self._index[task_id] for task_id in ids]
+            if after is not None:
+                tasks = [t for t in tasks if _order_key(t) > after]
+            tasks.sort(key=_order_key)
+            yield from tasks
+            return
+        
+        for done, keys in enumerate(self._order):
+            start = 0
+            if after is not None:
+                if done < after[0]:
+                    continue
+                if done == after[0]:
+                    start = bisect_right(keys, tuple(after[1:]))
+            for i in range(start, len(keys)):
+                task_id = keys[i][1]
+                if ids is None or task_id in ids:
+                    yield self._index[task_id]
+    
+    def _save_tasks(self, *records: Dict[str, Any]) -> bool:
+        """Persist change records, or queue them under batched durability."""
+        self._changed(len(records))
+        if self.durability == 'sync':
+            try:
+                with self.store.lock(), self._write_lock:
+                    self.store.write(list(records), self._snapshot)
+            except IOError as e:
+                raise Exception(f"Failed to save tasks: {e}")
+            self._publish(list(records))
             return True
-        except IOError as e:
-            raise Exception(f"Failed to save tasks: {e}")
+        
+        self._publish(list(records))
+        with self._buffer_lock:
+            self._pending_records.extend(records)
+            pending = len(self._pending_records)
+        if pending >= self.flush_threshold:
+            self._flush_requested.set()
+        return True
+    
+    def _snapshot(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Return the full current state for store compaction."""
+        with self._rw.read():
+            return ([task.to_dict() for task in self._index.values()],
+                    {'next_id': self._next_id, 'version': self._version})
+    
+    def flush(self) -> None:
+        """Write all queued change records to the storage backend."""
+        with self.store.lock(), self._write_lock:
+            with self._buffer_lock:
+                records, self._pending_records = self._pending_records, []
+            if not records:
+                return
+            try:
+                self.store.write(records, self._snapshot)
+            except IOError as e:
+                # Keep the records queued so a later flush can retry them
+                with self._buffer_lock:
+                    self._pending_records[:0] = records
+                raise Exception(f"Failed to save tasks: {e}")
+    
+    def _flush_loop(self) -> None:
+        """Background group-commit loop used under batched durability."""
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Warning: {e}")
+    
+    def close(self) -> None:
+        """Stop the background flusher and persist any queued changes."""
+        self._closed = True
+        if self._flusher is not None:
+            self._flush_requested.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
     
     def _get_next_id(self) -> int:
-        """Get the next available task ID."""
-        if not self.tasks:
-            return 1
-        return max(task['id'] for task in self.tasks) + 1
+        """Allocate the next task ID; IDs are never reused."""
+        task_id = self._next_id
+        self._next_id += 1
+        return task_id
     
-    def add_task(self, description: str, priority: str = 'medium', 
-                 category: str = 'general') -> int:
-        """Add a new task."""
-        # Input validation
+    def _apply_add(self, description: str, priority: str = 'medium',
+                   category: str = 'general') -> Dict[str, Any]:
+        """Create a task in memory and return its change record."""
+        # Input validation, before an ID is allocated
+        self._check_text_fields(description=description, priority=priority,
+                                category=category)
         if not description or not description.strip():
             raise ValueError("Task description cannot be empty")
         
-        # Sanitize inputs
+        # Sanitize inputs; missing (null) fields take their defaults
         description = description.strip()
+        priority = priority or 'medium'
         category = category.strip() if category else 'general'
         
-        task = {
-            'id': self._get_next_id(),
-            'description': description,
-            'priority': priority,
-            'category': category,
-            'status': 'pending',
-            'created_at': datetime.now().isoformat(),
-            'completed_at': None
-        }
+        task = Task(
+            id=self._get_next_id(),
+            description=description,
+            priority=priority,
+            category=category,
+            status='pending',
+            created_at=datetime.now(),
+            completed_at=None
+        )
         
-        self.tasks.append(task)
-        self._save_tasks()
-        return task['id']
+        self._index[task.id] = task
+        self._index_task(task)
+        return {'op': 'add', 'task': task.to_dict()}
+    
+    def _apply_update(self, task: Task,
+                      changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Change fields of a task in memory and return its change record."""
+        self._unindex_task(task)
+        try:
+            task.update(changes)
+        finally:
+            # Keep the task indexed under whatever values it now holds
+            self._index_task(task)
+        return {'op': 'update', 'id': task.id, 'changes': changes}
+    
+    def _apply_delete(self, task_ids: List[int]) -> Dict[str, Any]:
+        """Remove existing tasks from memory and return the change record."""
+        for task_id in task_ids:
+            self._unindex_task(self._index.pop(task_id))
+            if self._search is not None:
+                self._search.remove(task_id)
+        return {'op': 'delete', 'ids': task_ids}
+    
+    def add_task(self, description: str, priority: str = 'medium', 
+                 category: str = 'general') -> int:
+        """Add a new task."""
+        with self._mutation():
+            record = self._apply_add(description, priority, category)
+            self._save_tasks(record)
+            return record['task']['id']
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a copy of a single task by ID, or None if it does not exist."""
+        self._refresh()
+        with self._rw.read():
+            task = self._index.get(task_id)
+            return task.copy() if task is not None else None
     
     def list_tasks(self, status: str = 'all', category: Optional[str] = None,
-                   priority: Optional[str] = None) -> List[Dict[str, Any]]:
+                   priority: Optional[str] = None) -> List[Task]:
         """List tasks with optional filters."""
-        filtered_tasks = self.tasks.copy()
-        
-        # Filter by status
-        if status != 'all':
-            filtered_tasks = [t for t in filtered_tasks if t['status'] == status]
-        
-        # Filter by category
-        if category:
-            filtered_tasks = [t for t in filtered_tasks 
-                            if t['category'].lower() == category.lower()]
+        self._refresh()
+        self._ensure_indexes(for_query=True)
+        with self._rw.read():
+            if self._store_answers_queries:
+                return [Task.from_dict(row)
+                        for row in self.store.query_tasks(status, category, priority)]
+            if self._table is not None:
+                return [self._index[task_id]
+                        for task_id in self._table.select(status, category, priority)]
+            
+            # Already ordered by status (pending first) then by created date
+            return list(self._iter_ordered(self._filter_ids(status, category, priority)))
+    
+    def list_tasks_page(self, status: str = 'all', category: Optional[str] = None,
+                        priority: Optional[str] = None, cursor: Optional[str] = None,
+                        limit: Optional[int] = None,
+                        fields: Optional[Iterable[str]] = None
+                        ) -> Tuple[List[Any], Optional[str]]:
+        """List one page of tasks following ``cursor``, in list_tasks order.
         
-        # Filter by priority
-        if priority:
-            filtered_tasks = [t for t in filtered_tasks if t['priority'] == priority]
+        Only the requested page is materialized, optionally projected to
+        ``fields``. Returns the page and the cursor of the next page, which
+        is None once the listing is exhausted.
+        """
+        self._refresh()
+        self._ensure_indexes(for_query=True)
+        with self._rw.read():
+            if limit is not None and limit < 1:
+                raise ValueError("Page limit must be a positive integer")
+            fields = _check_fields(fields)
+            
+            after = _decode_cursor(cursor) if cursor else None
+            fetch = limit + 1 if limit is not None else None
+            if self._store_answers_queries:
+                if after is not None:
+                    after = (after[0], after[1].isoformat(), after[2])
+                tasks = [Task.from_dict(row) for row in self.store.query_tasks(
+                    status, category, priority, after=after, limit=fetch)]
+            elif (self._table is not None and np is not None
+                    and (status != 'all' or category or priority)):
+                # Vectorized filtering; unfiltered pages are cheaper to read
+                # straight off the pre-sorted order lists
+                tasks = [self._index[task_id] for task_id in self._table.select(
+                    status, category, priority, after, fetch)]
+            else:
+                ids = self._filter_ids(status, category, priority)
+                tasks = list(islice(self._iter_ordered(ids, after), fetch))
+            
+            next_cursor = None
+            if limit is not None and len(tasks) > limit:
+                tasks = tasks[:limit]
+                next_cursor = _encode_cursor(tasks[-1])
+            
+            if fields is not None:
+                tasks = [{f: task[f] for f in fields} for task in tasks]
+            return tasks, next_cursor
+    
+    def iter_tasks(self, status: str = 'all', category: Optional[str] = None,
+                   priority: Optional[str] = None,
+                   fields: Optional[Iterable[str]] = None,
+                   batch_size: int = 500) -> Iterator[Any]:
+        """Yield tasks in list_tasks order, materializing one batch at a time."""
+        cursor = None
+        while True:
+            tasks, cursor = self.list_tasks_page(status, category, priority,
+                                                 cursor, batch_size, fields)
+            yield from tasks
+            if cursor is None:
+                return
+    
+    def search(self, query: str, status: str = 'all', category: Optional[str] = None,
+               priority: Optional[str] = None, limit: Optional[int] = None,
+               offset: int = 0, fields: Optional[Iterable[str]] = None
+               ) -> Tuple[List[Any], int]:
+        """Search task descriptions, best matches first.
         
-        # Sort by status (pending first) then by created date
-        filtered_tasks.sort(key=lambda x: (x['status'] == 'completed', x['created_at']))
+        Every word of ``query`` must match a word of the description, in
+        full or (for three or more characters, ``SearchIndex.MIN_PREFIX``)
+        as its prefix. Ranking favours rare words, exact over partial
+        matches and short descriptions; ties keep list_tasks order. Returns
+        the page of ``limit`` results after ``offset``, optionally projected
+        to ``fields``, and the total number of matches. The index is built
+        on first use and maintained by every change from then on.
+        """
+        self._refresh()
+        self._ensure_indexes()
+        if self._search is None:
+            with self._rw.write():
+                if self._search is None:
+                    self._search = SearchIndex()
+                    for task in self._index.values():
+                        self._search.put(task.id, task.description)
         
-        return filtered_tasks
+        with self._rw.read():
+            if limit is not None and limit < 1:
+                raise ValueError("Page limit must be a positive integer")
+            if offset < 0:
+                raise ValueError("Offset must not be negative")
+            fields = _check_fields(fields)
+            if not tokenize(query):
+                raise ValueError("Search query cannot be empty")
+            
+            scores = self._search.search(query, self._filter_ids(status, category, priority))
+            
+            ranked = scores
+            if limit is not None and offset + limit < len(scores):
+                # Only tasks scoring at least the last wanted one need ordering
+                cutoff = heapq.nlargest(offset + limit, scores.values())[-1]
+                ranked = [task_id for task_id, score in scores.items() if score >= cutoff]
+            ranked = sorted(ranked, key=lambda task_id: (-scores[task_id],
+                                                         _order_key(self._index[task_id])))
+            end = offset + limit if limit is not None else None
+            tasks = [self._index[task_id] for task_id in ranked[offset:end]]
+            
+            if fields is not None:
+                tasks = [{f: task[f] for f in fields} for task in tasks]
+            return tasks, len(scores)
     
     def complete_task(self, task_id: int) -> bool:
         """Mark a task as completed."""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                task['status'] = 'completed'
-                task['completed_at'] = datetime.now().isoformat()
-                self._save_tasks()
-                return True
-        return False
+        with self._mutation():
+            task = self._index.get(task_id)
+            if task is None:
+                return False
+            
+            self._save_tasks(self._apply_update(task, {
+                'status': 'completed',
+                'completed_at': datetime.now().isoformat()
+            }))
+            return True
     
     def delete_task(self, task_id: int) -> bool:
         """Delete a task."""
-        for i, task in enumerate(self.tasks):
-            if task['id'] == task_id:
-                del self.tasks[i]
-                self._save_tasks()
-                return True
-        return False
+        with self._mutation():
+            if task_id not in self._index:
+                return False
+            
+            self._save_tasks(self._apply_delete([task_id]))
+            return True
     
     def update_task(self, task_id: int, description: Optional[str] = None,
                     priority: Optional[str] = None, 
                     category: Optional[str] = None) -> bool:
         """Update task properties."""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                if description:
-                    task['description'] = description
-                if priority:
-                    task['priority'] = priority
-                if category:
-                    task['category'] = category
-                self._save_tasks()
-                return True
-        return False
+        with self._mutation():
+            task = self._index.get(task_id)
+            if task is None:
+                return False
+            
+            self._save_tasks(self._apply_update(
+                task, self._update_changes(description, priority, category)))
+            return True
+    
+    @staticmethod
+    def _update_changes(description: Optional[str] = None,
+                        priority: Optional[str] = None,
+                        category: Optional[str] = None) -> Dict[str, Any]:
+        """Collect the non-empty fields of an update."""
+        TaskManager._check_text_fields(description=description, priority=priority,
+                                       category=category)
+        changes = {}
+        if description:
+            changes['description'] = description
+        if priority:
+            changes['priority'] = priority
+        if category:
+            changes['category'] = category
+        return changes
+    
+    @staticmethod
+    def _check_text_fields(**fields: Any) -> None:
+        """Raise ValueError unless every given field is a string or None."""
+        for name, value in fields.items():
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"Task {name} must be a string")
     
     def clear_completed(self) -> int:
         """Clear all completed tasks."""
-        initial_count = len(self.tasks)
-        self.tasks = [t for t in self.tasks if t['status'] != 'completed']
-        self._save_tasks()
-        return initial_count - len(self.tasks)
+        self._ensure_indexes()
+        with self._mutation():
+            removed = sorted(self._by_status.get('completed', ()))
+            if removed:
+                self._save_tasks(self._apply_delete(removed))
+            return len(removed)
+    
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> List[int]:
+        """Apply many operations atomically and persist them once.
+        
+        Each operation is a dict with an ``op`` of ``add`` (with
+        ``description`` and optional ``priority``/``category``), ``update``
+        (``id`` plus fields to change), ``complete`` or ``delete`` (``id``).
+        The whole batch is validated first; if any operation is invalid a
+        ValueError is raised and nothing is applied. Should applying still
+        fail part way, the operations already applied are undone in memory
+        before the error propagates.
+        Returns the id of the task each operation affected.
+        """
+        with self._mutation():
+            self._validate_batch(operations)
+            
+            next_id = self._next_id
+            # Copies of the tasks the batch touches, as they were before it
+            originals: Dict[int, Task] = {}
+            records, results = [], []
+            try:
+                for operation in operations:
+                    kind = operation['op']
+                    if kind == 'add':
+                        record = self._apply_add(operation['description'],
+                                                 operation.get('priority', 'medium'),
+                                                 operation.get('category', 'general'))
+                        results.append(record['task']['id'])
+                    else:
+                        task_id = operation['id']
+                        if task_id < next_id and task_id not in originals:
+                            originals[task_id] = self._index[task_id].copy()
+                        if kind == 'delete':
+                            record = self._apply_delete([task_id])
+                        elif kind == 'complete':
+                            record = self._apply_update(self._index[task_id], {
+                                'status': 'completed',
+                                'completed_at': datetime.now().isoformat()
+                            })
+                        else:
+                            record = self._apply_update(self._index[task_id], self._update_changes(
+                                operation.get('description'), operation.get('priority'),
+                                operation.get('category')))
+                        results.append(task_id)
+                    records.append(record)
+            except BaseException:
+                self._undo_batch(originals, next_id)
+                raise
+            
+            self._save_tasks(*records)
+            return results
+    
+    def _undo_batch(self, originals: Dict[int, Task], next_id: int) -> None:
+        """Restore the in-memory state from before a partly applied batch."""
+        for task_id in range(next_id, self._next_id):
+            if task_id in self._index:
+                self._apply_delete([task_id])
+        for task_id, original in originals.items():
+            current = self._index.get(task_id)
+            if current is not None:
+                self._unindex_task(current)
+            self._index[task_id] = original
+            self._index_task(original)
+        self._next_id = next_id
+    
+    def _validate_batch(self, operations: List[Dict[str, Any]]) -> None:
+        """Check a batch against the current state without modifying it."""
+        if not isinstance(operations, list):
+            raise ValueError("Operations must be a list")
+        
+        next_id = self._next_id
+        added, deleted = set(), set()
+        for i, operation in enumerate(operations):
+            kind = operation.get('op') if isinstance(operation, dict) else None
+            if kind in ('add', 'update'):
+                description = operation.get('description')
+                try:
+                    self._check_text_fields(description=description,
+                                            priority=operation.get('priority'),
+                                            category=operation.get('category'))
+                except ValueError as e:
+                    raise ValueError(f"Operation {i}: {e}")
+                if ((description is not None or kind == 'add')
+                        and not (description or '').strip()):
+                    raise ValueError(f"Operation {i}: task description cannot be empty")
+            
+            if kind == 'add':
+                added.add(next_id)
+                next_id += 1
+            elif kind in ('update', 'complete', 'delete'):
+                task_id = operation.get('id')
+                if (not isinstance(task_id, int)
+                        or (task_id not in self._index and task_id not in added)
+                        or task_id in deleted):
+                    raise ValueError(f"Operation {i}: task {task_id} not found")
+                if kind == 'delete':
+                    deleted.add(task_id)
+            else:
+                raise ValueError(f"Operation {i}: unknown operation {kind!r}")
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get task statistics."""
-        total = len(self.tasks)
+        self._refresh()
+        self._ensure_indexes(for_query=True)
+        with self._rw.read():
+            if self._store_answers_queries:
+                total, pending, by_priority, by_category = self.store.count_tasks()
+                return self._format_statistics(total, pending, by_priority, by_category)
+            if self._table is not None:
+                return self._format_statistics(*self._table.counts())
+            
+            return self._running_statistics()
+    
+    def _running_statistics(self) -> Dict[str, Any]:
+        """Build statistics from the running counters."""
+        # The index set sizes double as running status/priority counters
+        total = len(self._index)
+        pending = len(self._by_status.get('pending', ()))
+        by_priority = {p: len(ids) for p, ids in self._by_priority.items()}
+        
+        return self._format_statistics(total, pending, by_priority,
+                                       dict(self._category_counts))
+    
+    def check_statistics(self, repair: bool = True) -> bool:
+        """Verify the running statistics against a full scan of all tasks.
+        
+        Returns True if they agree. On a mismatch the indexes and counters
+        are rebuilt from the primary index when ``repair`` is set.
+        """
+        self._ensure_indexes()
+        with self._rw.write():
+            total = len(self._index)
+            pending = len([t for t in self._index.values() if t.status == 'pending'])
+            
+            # Count by priority
+            by_priority = {}
+            for priority in ['low', 'medium', 'high']:
+                count = len([t for t in self._index.values() if t.priority == priority])
+                if count > 0:
+                    by_priority[priority] = count
+            
+            # Count by category
+            by_category = {}
+            for task in self._index.values():
+                category = task.category
+                by_category[category] = by_category.get(category, 0) + 1
+            
+            expected = self._format_statistics(total, pending, by_priority, by_category)
+            consistent = expected == self._running_statistics()
+            if not consistent and repair:
+                self._rebuild_indexes()
+            return consistent
+    
+    def _format_statistics(self, total: int, pending: int,
+                           by_priority: Dict[str, int],
+                           by_category: Dict[str, int]) -> Dict[str, Any]:
+        """Shape raw counts into the statistics dictionary."""
         if total == 0:
             return {
                 'total': 0,
@@ -156,82 +1249,25 @@ class TaskManager:
                 'by_category': {}
             }
         
-        pending = len([t for t in self.tasks if t['status'] == 'pending'])
         completed = total - pending
-        
-        # Count by priority
-        by_priority = {}
-        for priority in ['low', 'medium', 'high']:
-            count = len([t for t in self.tasks if t['priority'] == priority])
-            if count > 0:
-                by_priority[priority] = count
-        
-        # Count by category
-        by_category = {}
-        for task in self.tasks:
-            category = task['category']
-            by_category[category] = by_category.get(category, 0) + 1
-        
         return {
             'total': total,
             'pending': pending,
             'completed': completed,
             'completion_rate': round((completed / total) * 100, 1),
-            'by_priority': by_priority,
+            'by_priority': {p: by_priority[p] for p in ['low', 'medium', 'high']
+                            if by_priority.get(p)},
             'by_category': by_category
         }
     
-    def display_tasks(self, tasks: List[Dict[str, Any]]) -> None:
+    def display_tasks(self, tasks: List[Task]) -> None:
         """Display tasks in a formatted table."""
-        if not tasks:
-            print("No tasks to display.")
-            return
-        
-        # Print header
-        print("\n" + "=" * 80)
-        print(f"{'ID':<5} {'Status':<12} {'Priority':<10} {'Category':<15} {'Description':<30}")
-        print("=" * 80)
-        
-        # Print tasks
-        for task in tasks:
-            status_symbol = "[X]" if task['status'] == 'completed' else "[ ]"
-            priority_symbol = self._get_priority_symbol(task['priority'])
-            description = task['description'][:30] + '...' if len(task['description']) > 30 else task['description']
-            
-            print(f"{task['id']:<5} {status_symbol:<12} {priority_symbol:<10} "
-                  f"{task['category']:<15} {description:<30}")
-        
-        print("=" * 80)
-        print(f"Total: {len(tasks)} task(s)\n")
+        display_tasks(tasks)
     
     def display_statistics(self, stats: Dict[str, Any]) -> None:
         """Display task statistics."""
-        print("\n" + "=" * 50)
-        print("TASK STATISTICS")
-        print("=" * 50)
-        
-        print(f"Total tasks:      {stats['total']}")
-        print(f"Pending tasks:    {stats['pending']}")
-        print(f"Completed tasks:  {stats['completed']}")
-        print(f"Completion rate:  {stats['completion_rate']}%")
-        
-        if stats['by_priority']:
-            print("\nBy Priority:")
-            for priority, count in stats['by_priority'].items():
-                print(f"  {priority.capitalize():<10} {count}")
-        
-        if stats['by_category']:
-            print("\nBy Category:")
-            for category, count in sorted(stats['by_category'].items()):
-                print(f"  {category:<15} {count}")
-        
-        print("=" * 50 + "\n")
+        display_statistics(stats)
     
     def _get_priority_symbol(self, priority: str) -> str:
         """Get a visual symbol for priority level."""
-        symbols = {
-            'low': '🟢 Low',
-            'medium': '🟡 Med',
-            'high': '🔴 HIGH!'
-        }
-        return symbols.get(priority, '⚪ Unknown')
\ No newline at end of file
+        return priority_symbol(priority)
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Unit tests for the JSON codec.
+"""
+
+from datetime import datetime
+import pytest
+import codec
+
+
+SAMPLE = {
+    'next_id': 3,
+    'tasks': [
+        {'id': 1, 'description': "Café ☕ \"quoted\"", 'status': 'pending',
+         'priority': 'high', 'category': None, 'created_at': '2024-01-01T09:30:00',
+         'completed_at': None},
+        {'id': 2, 'description': "Task 2", 'completion_rate': 66.7,
+         'tags': [], 'done': True}
+    ]
+}
+
+
+@pytest.fixture
+def stdlib_codec(monkeypatch):
+    """Force the standard library fallback."""
+    monkeypatch.setattr(codec, 'orjson', None)
+    return codec
+
+
+def test_compact_output(stdlib_codec):
+    """Test that output uses compact separators and raw UTF-8."""
+    data = stdlib_codec.dumps({'a': [1, 2], 'b': "é"})
+    assert data == '{"a":[1,2],"b":"é"}'.encode()
+
+
+def test_round_trip(stdlib_codec):
+    """Test that decoding accepts both bytes and text."""
+    data = stdlib_codec.dumps(SAMPLE)
+    assert stdlib_codec.loads(data) == SAMPLE
+    assert stdlib_codec.loads(data.decode()) == SAMPLE
+
+
+def test_datetimes_use_iso_format(stdlib_codec):
+    """Test that datetimes serialize as ISO 8601 strings."""
+    moment = datetime(2024, 1, 1, 9, 30, 0, 250000)
+    assert stdlib_codec.dumps([moment]) == b'["2024-01-01T09:30:00.250000"]'
+
+
+def test_matches_orjson(monkeypatch):
+    """Test that the orjson and stdlib paths produce identical bytes."""
+    pytest.importorskip('orjson')
+    moment = datetime(2024, 1, 1, 9, 30)
+    fast = codec.dumps([SAMPLE, moment])
+
+    monkeypatch.setattr(codec, 'orjson', None)
+    assert codec.dumps([SAMPLE, moment]) == fast
+
+
+def test_read_task_file(tmp_path):
+    """Test that task files may be a JSON array or JSON lines."""
+    tasks = [{'description': "Café"}, {'description': "Task 2", 'priority': 'high'}]
+    array_file = tmp_path / 'tasks.json'
+    array_file.write_bytes(codec.dumps(tasks))
+    lines_file = tmp_path / 'tasks.jsonl'
+    lines_file.write_bytes(b'\n'.join(codec.dumps(task) for task in tasks) + b'\n\n')
+
+    assert codec.read_task_file(str(array_file)) == tasks
+    assert codec.read_task_file(str(lines_file)) == tasks
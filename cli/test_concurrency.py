@@ -0,0 +1,146 @@
+"""
+Tests for sharing a TaskManager between threads and processes.
+"""
+
+import multiprocessing
+import threading
+import pytest
+from locking import ReadWriteLock
+from storage import AppendLogStore, SQLiteTaskStore
+from task_manager import TaskManager
+
+
+def _add_tasks(data_file, count):
+    """Worker process: add ``count`` tasks through its own TaskManager."""
+    manager = TaskManager(data_file)
+    for i in range(count):
+        manager.add_task(f"Task {i}")
+
+
+class TestReadWriteLock:
+    """Test suite for the reader/writer lock."""
+
+    def test_readers_share_lock(self):
+        """Test that several threads can hold the read lock at once."""
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not inside.broken
+
+    def test_writer_reentrant(self):
+        """Test that the writing thread may re-enter for reading or writing."""
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.read():
+                with lock.write():
+                    pass
+        with lock.read():
+            pass
+
+
+class TestMultipleManagers:
+    """Test suite for managers in different processes sharing one store."""
+
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        """Path of the shared data file."""
+        return str(tmp_path / "shared_tasks.json")
+
+    def test_changes_visible_across_managers(self, data_file):
+        """Test that each manager sees the other's writes without clobbering."""
+        manager1 = TaskManager(data_file)
+        manager2 = TaskManager(data_file)
+
+        id1 = manager1.add_task("From manager 1")
+        id2 = manager2.add_task("From manager 2")
+        assert (id1, id2) == (1, 2)
+
+        manager2.complete_task(id1)
+        assert manager1.get_task(id1)['status'] == 'completed'
+        assert [t['id'] for t in manager1.list_tasks()] == [id2, id1]
+        assert manager1.get_statistics()['completed'] == 1
+
+        manager1.delete_task(id2)
+        assert manager2.get_task(id2) is None
+        assert TaskManager(data_file).tasks == manager2.tasks
+        assert manager1.version == manager2.version == 4
+
+    def test_reload_after_foreign_compaction(self, data_file):
+        """Test that a compaction by another manager triggers a full reload."""
+        manager1 = TaskManager(data_file, store=AppendLogStore(data_file, compact_threshold=2))
+        manager2 = TaskManager(data_file)
+        events = []
+        manager2.subscribe(events.append)
+
+        manager1.add_task("Task 1")
+        manager1.add_task("Task 2")
+        assert len(manager2.tasks) == 2
+        assert manager2.add_task("Task 3") == 3
+        assert [e['type'] for e in events] == ['reload', 'created']
+
+    def test_foreign_changes_are_published(self, data_file):
+        """Test that changes picked up from another manager are published."""
+        manager1 = TaskManager(data_file)
+        manager2 = TaskManager(data_file)
+        events = []
+        manager2.subscribe(events.append)
+
+        task_id = manager1.add_task("Task 1")
+        manager1.complete_task(task_id)
+        assert manager2.version == 2
+        assert [(e['type'], e['version']) for e in events] == [('created', 1), ('completed', 2)]
+        assert events[1]['task']['status'] == 'completed'
+
+    def test_sqlite_changes_visible(self, tmp_path):
+        """Test cross-connection change detection for the SQLite store."""
+        db_file = str(tmp_path / "shared.db")
+        manager1 = TaskManager(db_file, store=SQLiteTaskStore(db_file))
+        manager2 = TaskManager(db_file, store=SQLiteTaskStore(db_file))
+
+        manager1.add_task("Task 1")
+        assert manager2.add_task("Task 2") == 2
+        assert manager1.get_task(2)['description'] == "Task 2"
+        assert manager1.version == manager2.version == 2
+
+    def test_concurrent_threads(self, data_file):
+        """Test that concurrent mutations from threads are all kept."""
+        manager = TaskManager(data_file)
+
+        def worker():
+            for i in range(50):
+                task_id = manager.add_task(f"Task {i}")
+                manager.list_tasks(status='pending')
+                manager.complete_task(task_id)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(t['id'] for t in manager.tasks) == list(range(1, 401))
+        assert manager.get_statistics()['completed'] == 400
+        assert manager.check_statistics() is True
+        assert TaskManager(data_file).tasks == manager.tasks
+
+    def test_concurrent_processes(self, data_file):
+        """Test that worker processes never hand out the same ID."""
+        workers = [multiprocessing.Process(target=_add_tasks, args=(data_file, 25))
+                   for _ in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+            assert p.exitcode == 0
+
+        ids = [t['id'] for t in TaskManager(data_file).tasks]
+        assert sorted(ids) == list(range(1, 101))
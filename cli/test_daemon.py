@@ -0,0 +1,95 @@
+"""
+Tests for serving a TaskManager to CLI processes over a Unix socket.
+"""
+
+import socket
+import threading
+import pytest
+import daemon
+from daemon import DaemonClient, create_server
+from task import Task
+from task_manager import TaskManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """TaskManager served by the daemon."""
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def server(manager, tmp_path):
+    """Daemon serving ``manager`` from a background thread."""
+    server = create_server(manager, str(tmp_path / "tasks.sock"))
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05})
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestDaemon:
+    """Test suite for the task daemon and its client."""
+
+    def test_client_matches_manager(self, server, manager):
+        """Test that calls through the client act on the daemon's manager."""
+        with DaemonClient.connect(server.server_address) as client:
+            task_id = client.add_task("Via daemon", priority='high')
+            assert client.complete_task(task_id)
+            assert not client.delete_task(999)
+
+            task = client.get_task(task_id)
+            assert isinstance(task, Task)
+            assert task.status == 'completed'
+            assert [t.id for t in client.list_tasks(priority='high')] == [task_id]
+            tasks, total = client.search("daemon")
+            assert ([t.id for t in tasks], total) == ([task_id], 1)
+            assert client.get_statistics() == manager.get_statistics()
+
+        assert manager.get_task(task_id)['status'] == 'completed'
+
+    def test_errors_are_reported(self, server):
+        """Test that failed and unknown calls raise without stopping the daemon."""
+        with DaemonClient.connect(server.server_address) as client:
+            with pytest.raises(Exception, match="Unknown method"):
+                client.call('close')
+            with pytest.raises(Exception):
+                client.search("")
+            assert client.add_task("Still serving") == 1
+
+    def test_oversized_request_is_rejected(self, server, monkeypatch):
+        """Test that a request over the size limit fails as a whole."""
+        monkeypatch.setattr(daemon, 'MAX_REQUEST_SIZE', 128)
+        with DaemonClient.connect(server.server_address) as client:
+            with pytest.raises(Exception, match="Request too large"):
+                client.add_task("x" * 1000)
+            # The connection stays in step for the next request
+            assert client.add_task("Small") == 1
+
+    def test_connect_without_daemon(self, tmp_path):
+        """Test that connect() returns None when nothing is listening."""
+        path = str(tmp_path / "missing.sock")
+        assert DaemonClient.connect(path) is None
+
+        # A socket file left behind by a dead daemon
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        assert DaemonClient.connect(path) is None
+
+    def test_replaces_stale_socket(self, manager, tmp_path):
+        """Test that a new daemon binds over a dead daemon's socket but not a live one."""
+        path = str(tmp_path / "tasks.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+
+        server = create_server(manager, path)
+        try:
+            with pytest.raises(OSError, match="already listening"):
+                create_server(manager, path)
+        finally:
+            server.server_close()
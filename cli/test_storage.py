@@ -0,0 +1,314 @@
+"""
+Unit tests for the TaskManager storage backends.
+"""
+
+import json
+import os
+import pytest
+import storage
+from storage import (AppendLogStore, IndexedLogStore, JSONFileStore, SQLiteTaskStore,
+                     SnapshotWriter)
+from task_manager import TaskManager
+
+
+class TestAppendLogStore:
+    """Test suite for the append-only log store."""
+
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        """Path of the snapshot file used by the store."""
+        return str(tmp_path / "tasks.json")
+
+    def test_mutations_append_to_log(self, data_file):
+        """Test that each mutation appends one record instead of rewriting."""
+        manager = TaskManager(data_file)
+        task_id = manager.add_task("Logged task")
+        manager.complete_task(task_id)
+
+        with open(f"{data_file}.log") as f:
+            records = [json.loads(line) for line in f]
+        assert [r['op'] for r in records] == ['add', 'update']
+        assert records[1]['changes']['status'] == 'completed'
+
+    def test_replay_snapshot_and_log(self, data_file):
+        """Test that startup replays the snapshot followed by the log."""
+        manager1 = TaskManager(data_file, store=AppendLogStore(data_file, compact_threshold=3))
+        id1 = manager1.add_task("Task 1")
+        id2 = manager1.add_task("Task 2")
+        manager1.add_task("Task 3")  # triggers compaction
+        manager1.complete_task(id1)
+        manager1.delete_task(id2)
+
+        manager2 = TaskManager(data_file)
+        assert [t['id'] for t in manager2.tasks] == [1, 3]
+        assert manager2.tasks[0]['status'] == 'completed'
+
+    def test_compaction_writes_snapshot(self, data_file):
+        """Test that reaching the threshold folds the log into the snapshot."""
+        store = AppendLogStore(data_file, compact_threshold=2)
+        manager = TaskManager(data_file, store=store)
+        manager.add_task("Task 1")
+        manager.add_task("Task 2")
+
+        with open(data_file) as f:
+            assert len(json.load(f)['tasks']) == 2
+        with open(f"{data_file}.log") as f:
+            assert f.read() == ''
+        assert store.log_records == 0
+
+    def test_replay_over_compacted_snapshot(self, data_file):
+        """Test that replaying a log already folded into the snapshot is harmless."""
+        manager = TaskManager(data_file)
+        id1 = manager.add_task("Task 1")
+        manager.add_task("Task 2")
+        manager.delete_task(id1)
+        with open(f"{data_file}.log") as f:
+            log = f.read()
+
+        manager.store.compact(manager.tasks, {'next_id': 3})
+        with open(f"{data_file}.log", 'w') as f:
+            f.write(log)
+
+        assert [t['id'] for t in TaskManager(data_file).tasks] == [2]
+
+    def test_torn_log_tail_is_discarded(self, data_file):
+        """Test that a partially written final record is dropped on load."""
+        manager = TaskManager(data_file)
+        manager.add_task("Task 1")
+        with open(f"{data_file}.log", 'a') as f:
+            f.write('{"op": "add", "task": {"id": 2')
+
+        manager2 = TaskManager(data_file)
+        assert len(manager2.tasks) == 1
+        manager2.add_task("Task 2")
+        assert len(TaskManager(data_file).tasks) == 2
+
+    def test_reads_legacy_json_file(self, data_file):
+        """Test that a file written by JSONFileStore loads unchanged."""
+        legacy = TaskManager(data_file, store=JSONFileStore(data_file))
+        legacy.add_task("Legacy task")
+
+        manager = TaskManager(data_file)
+        assert manager.tasks[0]['description'] == "Legacy task"
+
+
+class TestIndexedLogStore:
+    """Test suite for lazily loaded, memory-mapped snapshots."""
+
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        """Path of the snapshot file used by the store."""
+        return str(tmp_path / "tasks.json")
+
+    def populate(self, data_file, count):
+        """Write ``count`` tasks and compact them into an indexed snapshot."""
+        manager = TaskManager(data_file, store=IndexedLogStore(data_file))
+        ids = [manager.add_task(f"Task {i}") for i in range(count)]
+        manager.store.compact(*manager._snapshot())
+        return ids
+
+    def test_lazy_load_decodes_on_access(self, data_file):
+        """Test that a lazy manager decodes only the tasks it touches."""
+        ids = self.populate(data_file, 5)
+
+        manager = TaskManager(data_file, lazy=True)
+        manager.complete_task(ids[2])
+        assert len(manager._index._loaded) == 1
+        assert manager.get_task(ids[2])['status'] == 'completed'
+
+        reloaded = TaskManager(data_file, lazy=True)
+        assert [t['status'] for t in reloaded.tasks] == ['pending'] * 2 + ['completed'] + ['pending'] * 2
+        assert reloaded.get_statistics()['total'] == 5
+
+    def test_lazy_mutations_and_listing(self, data_file):
+        """Test adds and deletes on top of the snapshot, then a listing."""
+        ids = self.populate(data_file, 3)
+
+        manager = TaskManager(data_file, lazy=True)
+        new_id = manager.add_task("Task 3", priority='high')
+        assert manager.delete_task(ids[0])
+        assert ids[0] not in manager._index
+        assert new_id == ids[-1] + 1
+        assert [t['id'] for t in manager.list_tasks(priority='high')] == [new_id]
+        assert len(manager.list_tasks()) == 3
+        assert manager.check_statistics(repair=False)
+
+        reloaded = TaskManager(data_file, lazy=True)
+        assert [t['id'] for t in reloaded.tasks] == ids[1:] + [new_id]
+
+    def test_lazy_clear_completed(self, data_file):
+        """Test that clearing completed tasks works before any listing."""
+        ids = self.populate(data_file, 3)
+        TaskManager(data_file, lazy=True).complete_task(ids[1])
+
+        manager = TaskManager(data_file, lazy=True)
+        assert manager.clear_completed() == 1
+        assert [t['id'] for t in TaskManager(data_file, lazy=True).tasks] == [ids[0], ids[2]]
+
+    def test_converts_single_document_snapshot(self, data_file):
+        """Test that a snapshot written by AppendLogStore is converted once."""
+        manager = TaskManager(data_file)
+        manager.add_task("Old format")
+        manager.store.compact(*manager._snapshot())
+        assert not os.path.exists(f"{data_file}.idx")
+
+        lazy = TaskManager(data_file, lazy=True)
+        assert lazy.tasks[0]['description'] == "Old format"
+        assert os.path.exists(f"{data_file}.idx")
+        # The line format still loads eagerly
+        assert TaskManager(data_file).tasks[0]['description'] == "Old format"
+
+    def test_stale_index_is_rebuilt(self, data_file):
+        """Test that an index describing another snapshot is not trusted."""
+        self.populate(data_file, 2)
+        # Rewrite the snapshot without touching the index
+        eager = TaskManager(data_file)
+        eager.add_task("Third")
+        eager.store.compact(*eager._snapshot())
+
+        manager = TaskManager(data_file, lazy=True)
+        assert [t['description'] for t in manager.tasks] == ["Task 0", "Task 1", "Third"]
+
+
+class TestSnapshotWriter:
+    """Test suite for atomic snapshot writes and backup rotation."""
+
+    def test_compact_atomic_write(self, tmp_path):
+        """Test that snapshots are compact and leave no temporary files."""
+        path = str(tmp_path / "tasks.json")
+        SnapshotWriter(path).write([{'id': 1}], {'next_id': 2})
+
+        with open(path) as f:
+            assert f.read() == '{"next_id":2,"tasks":[{"id":1}]}'
+        assert os.listdir(tmp_path) == ["tasks.json"]
+
+    def test_failed_write_keeps_old_snapshot(self, tmp_path, monkeypatch):
+        """Test that a failure before the rename leaves the old file intact."""
+        path = str(tmp_path / "tasks.json")
+        writer = SnapshotWriter(path, backup_interval=None)
+        writer.write([{'id': 1}], {})
+
+        def fail(*args):
+            raise OSError("disk full")
+        monkeypatch.setattr(storage.os, 'replace', fail)
+        with pytest.raises(OSError):
+            writer.write([{'id': 2}], {})
+
+        assert storage.read_snapshot(path)[0] == [{'id': 1}]
+        assert os.listdir(tmp_path) == ["tasks.json"]
+
+    def test_backups_follow_schedule(self, tmp_path):
+        """Test that backups rotate only once the interval has passed."""
+        path = str(tmp_path / "tasks.json")
+        writer = SnapshotWriter(path, backup_interval=3600, backup_count=2)
+        for i in range(3):
+            writer.write([{'id': i}], {})
+        # Only the first overwrite was due for a backup
+        assert storage.read_snapshot(f"{path}.backup")[0] == [{'id': 0}]
+        assert not os.path.exists(f"{path}.backup.1")
+
+        writer.backup_interval = 0
+        writer.write([{'id': 3}], {})
+        writer.write([{'id': 4}], {})
+        writer.write([{'id': 5}], {})
+        assert storage.read_snapshot(f"{path}.backup")[0] == [{'id': 4}]
+        assert storage.read_snapshot(f"{path}.backup.1")[0] == [{'id': 3}]
+        assert not os.path.exists(f"{path}.backup.2")
+
+
+class TestSQLiteTaskStore:
+    """Test suite for the SQLite store."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a TaskManager backed by a temporary SQLite database."""
+        db_file = str(tmp_path / "tasks.db")
+        return TaskManager(db_file, store=SQLiteTaskStore(db_file))
+
+    def test_persistence(self, tmp_path, manager):
+        """Test that mutations are written to the database."""
+        id1 = manager.add_task("Task 1", category="work")
+        id2 = manager.add_task("Task 2")
+        manager.complete_task(id1)
+        manager.update_task(id2, description="Task 2 updated")
+
+        reloaded = TaskManager(manager.data_file, store=SQLiteTaskStore(manager.data_file))
+        assert reloaded.tasks[0]['status'] == 'completed'
+        assert reloaded.tasks[1]['description'] == "Task 2 updated"
+
+        reloaded.delete_task(id2)
+        assert [t['id'] for t in reloaded.store.load()[0]] == [id1]
+
+    def test_list_tasks_uses_sql(self, manager):
+        """Test filtered listing and ordering through SQL."""
+        id1 = manager.add_task("Work task", priority="high", category="Work")
+        id2 = manager.add_task("Other task", priority="low", category="home")
+        id3 = manager.add_task("Another work task", priority="high", category="work")
+        manager.complete_task(id1)
+
+        assert [t['id'] for t in manager.list_tasks()] == [id2, id3, id1]
+        assert [t['id'] for t in manager.list_tasks(category="WORK")] == [id3, id1]
+        assert [t['id'] for t in manager.list_tasks(status="pending", priority="high")] == [id3]
+
+    def test_list_tasks_page_uses_sql(self, manager):
+        """Test keyset pagination through SQL."""
+        ids = [manager.add_task(f"Task {i}") for i in range(5)]
+        manager.complete_task(ids[0])
+
+        page, cursor = manager.list_tasks_page(limit=3, fields=['id'])
+        assert page == [{'id': ids[1]}, {'id': ids[2]}, {'id': ids[3]}]
+        page, cursor = manager.list_tasks_page(cursor=cursor, limit=3)
+        assert [t['id'] for t in page] == [ids[4], ids[0]]
+        assert cursor is None
+
+    def test_statistics_match_in_memory(self, tmp_path, manager):
+        """Test that SQL statistics match the in-memory computation."""
+        json_manager = TaskManager(str(tmp_path / "tasks.json"))
+        for m in (manager, json_manager):
+            m.add_task("Task 1", priority="high", category="work")
+            m.add_task("Task 2", priority="low", category="personal")
+            m.complete_task(m.add_task("Task 3", priority="high", category="work"))
+
+        assert manager.get_statistics() == json_manager.get_statistics()
+
+    def test_batched_reads_see_queued_changes(self, tmp_path):
+        """Test that batched durability answers reads from memory, not stale SQL."""
+        db_file = str(tmp_path / "tasks.db")
+        manager = TaskManager(db_file, store=SQLiteTaskStore(db_file), durability='batched',
+                              flush_interval=3600)
+        try:
+            task_id = manager.add_task("Queued task")
+            assert [t['id'] for t in manager.list_tasks()] == [task_id]
+            assert [t['id'] for t in manager.list_tasks_page(limit=10)[0]] == [task_id]
+            assert manager.get_statistics()['total'] == 1
+        finally:
+            manager.close()
+
+    def test_migrate_json_once(self, tmp_path):
+        """Test that a JSON store is migrated once, even from its change log alone."""
+        json_file = str(tmp_path / "tasks.json")
+        json_manager = TaskManager(json_file)
+        json_manager.add_task("Task 1")
+        json_manager.add_task("Task 2")
+        assert not os.path.exists(json_file)
+
+        db_file = str(tmp_path / "tasks.db")
+        assert SQLiteTaskStore(db_file).migrate_json(json_file) == 2
+
+        manager = TaskManager(db_file, store=SQLiteTaskStore(db_file))
+        assert manager.apply_batch([{'op': 'delete', 'id': t['id']} for t in manager.tasks])
+        # Deleting everything must not bring the JSON tasks back
+        assert SQLiteTaskStore(db_file).migrate_json(json_file) is None
+        assert SQLiteTaskStore(db_file).is_empty()
+
+    def test_import_json(self, tmp_path):
+        """Test migrating an existing JSON store into SQLite."""
+        json_file = str(tmp_path / "tasks.json")
+        json_manager = TaskManager(json_file)
+        json_manager.add_task("Task 1")
+        json_manager.complete_task(json_manager.add_task("Task 2"))
+
+        store = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+        assert store.is_empty()
+        assert store.import_json(json_file) == 2
+        assert store.load()[0] == json_manager.tasks
@@ -0,0 +1,58 @@
+"""
+Unit tests for the compact Task record.
+"""
+
+from datetime import datetime
+import pytest
+from task import Task
+
+
+SERIALIZED = {
+    'id': 1,
+    'description': "Write report",
+    'priority': 'high',
+    'category': 'work',
+    'status': 'pending',
+    'created_at': '2024-01-01T09:30:00.250000',
+    'completed_at': None
+}
+
+
+def test_round_trip():
+    """Test that a task serializes back to the dict it was built from."""
+    task = Task.from_dict(SERIALIZED)
+    assert isinstance(task.created_at, datetime)
+    assert task.to_dict() == SERIALIZED
+    assert task == SERIALIZED
+    assert dict(task) == SERIALIZED
+
+
+def test_no_per_instance_dict():
+    """Test that tasks use slots instead of a per-instance dict."""
+    task = Task.from_dict(SERIALIZED)
+    assert not hasattr(task, '__dict__')
+    with pytest.raises(AttributeError):
+        task.tags = []
+
+
+def test_shared_values_are_interned():
+    """Test that equal status/priority/category values share one object."""
+    task1 = Task.from_dict(SERIALIZED)
+    task2 = Task(2, "Other", ''.join(['hi', 'gh']), ''.join(['wo', 'rk']),
+                 ''.join(['pend', 'ing']), datetime.now())
+    assert task1.priority is task2.priority
+    assert task1.category is task2.category
+    assert task1.status is task2.status
+
+
+def test_update_parses_serialized_values():
+    """Test that updates accept serialized values and copies are independent."""
+    task = Task.from_dict(SERIALIZED)
+    copy = task.copy()
+    task.update({'status': 'completed', 'completed_at': '2024-01-02T10:00:00'})
+
+    assert task.completed_at == datetime(2024, 1, 2, 10, 0)
+    assert task['completed_at'] == '2024-01-02T10:00:00'
+    assert copy['status'] == 'pending'
+    with pytest.raises(KeyError):
+        task['tags']
@@ -4,8 +4,10 @@ Unit tests for the TaskManager class.
 
 import json
 import os
+import time
 import pytest
 from datetime import datetime
+from storage import AppendLogStore
 from task_manager import TaskManager
 
 
@@ -81,6 +83,114 @@ class TestTaskManager:
         personal_tasks = manager.list_tasks(category="personal")
         assert len(personal_tasks) == 1
     
+    def test_list_tasks_combined_filters_after_updates(self, manager):
+        """Test that filtering follows updates, completions and deletes."""
+        id1 = manager.add_task("Task 1", priority="high", category="Work")
+        id2 = manager.add_task("Task 2", priority="high", category="work")
+        id3 = manager.add_task("Task 3", priority="low", category="home")
+        
+        manager.update_task(id3, priority="high", category="WORK")
+        manager.complete_task(id1)
+        manager.delete_task(id2)
+        
+        tasks = manager.list_tasks(category="work", priority="high")
+        assert [t['id'] for t in tasks] == [id3, id1]
+        assert manager.list_tasks(status="pending", category="home") == []
+        assert [t['id'] for t in manager.list_tasks(status="completed")] == [id1]
+    
+    def test_list_tasks_order(self, tmp_path):
+        """Test pending-first, oldest-first ordering across mutations."""
+        data_file = tmp_path / "order_tasks.json"
+        data_file.write_text(json.dumps([
+            {'id': i, 'description': f'Task {i}', 'priority': 'low',
+             'category': 'general', 'status': 'pending',
+             'created_at': created_at, 'completed_at': None}
+            for i, created_at in [(1, '2020-01-03T00:00:00'),
+                                  (2, '2020-01-01T00:00:00'),
+                                  (3, '2020-01-02T00:00:00')]
+        ]))
+        manager = TaskManager(str(data_file))
+        assert [t['id'] for t in manager.list_tasks()] == [2, 3, 1]
+        
+        manager.complete_task(2)
+        id4 = manager.add_task("Task 4")
+        assert [t['id'] for t in manager.list_tasks()] == [3, 1, id4, 2]
+        assert [t['id'] for t in manager.list_tasks(priority="low")] == [3, 1, 2]
+    
+    def test_list_tasks_page(self, manager):
+        """Test cursor pagination matches the full listing."""
+        for i in range(40):
+            task_id = manager.add_task(f"Task {i}", priority="high" if i % 10 == 0 else "low")
+            if i % 3 == 0:
+                manager.complete_task(task_id)
+        
+        for filters in ({}, {'priority': 'high'}, {'status': 'pending'}):
+            pages, cursor = [], None
+            while True:
+                page, cursor = manager.list_tasks_page(cursor=cursor, limit=7, **filters)
+                pages.extend(page)
+                if cursor is None:
+                    break
+            assert pages == manager.list_tasks(**filters)
+    
+    def test_list_tasks_page_fields(self, manager):
+        """Test field projection and argument validation."""
+        manager.add_task("Task 1")
+        manager.add_task("Task 2")
+        
+        page, cursor = manager.list_tasks_page(limit=1, fields=['id', 'status'])
+        assert page == [{'id': 1, 'status': 'pending'}]
+        assert manager.list_tasks_page(cursor=cursor)[0][0]['id'] == 2
+        
+        with pytest.raises(ValueError):
+            manager.list_tasks_page(fields=['secret'])
+        with pytest.raises(ValueError):
+            manager.list_tasks_page(limit=0)
+        with pytest.raises(ValueError):
+            manager.list_tasks_page(cursor='not-a-cursor')
+    
+    def test_iter_tasks(self, manager):
+        """Test that iterating in batches yields the full listing."""
+        for i in range(12):
+            manager.add_task(f"Task {i}", category="work" if i % 2 else "home")
+        manager.complete_task(1)
+        
+        assert list(manager.iter_tasks(batch_size=5)) == manager.list_tasks()
+        rows = list(manager.iter_tasks(category="home", fields=['id'], batch_size=2))
+        assert rows == [{'id': t['id']} for t in manager.list_tasks(category="home")]
+    
+    def test_search_ranks_matches(self, manager):
+        """Test word and prefix matching, ranking and pagination."""
+        id1 = manager.add_task("Write quarterly report")
+        id2 = manager.add_task("Report bug", category="work")
+        id3 = manager.add_task("Plan the reporting meeting with the whole team")
+        manager.add_task("Buy groceries")
+        
+        tasks, total = manager.search("report")
+        # Exact words beat prefixes; shorter descriptions rank higher
+        assert [t['id'] for t in tasks] == [id2, id1, id3]
+        assert total == 3
+        assert manager.search("REPORT quarterly", fields=['id']) == ([{'id': id1}], 1)
+        assert manager.search("report", category="work", fields=['id']) == ([{'id': id2}], 1)
+        assert manager.search("report", limit=2, offset=1, fields=['id']) == (
+            [{'id': id1}, {'id': id3}], 3)
+        assert manager.search("re") == ([], 0)  # too short for a prefix
+        with pytest.raises(ValueError):
+            manager.search("  ")
+    
+    def test_search_follows_mutations(self, manager):
+        """Test that the search index is kept up to date incrementally."""
+        id1 = manager.add_task("Draft proposal")
+        manager.search("draft")
+        id2 = manager.add_task("Review draft")
+        manager.update_task(id1, description="Final proposal")
+        manager.complete_task(id2)
+        
+        assert manager.search("draft", fields=['id']) == ([{'id': id2}], 1)
+        assert manager.search("final", fields=['id']) == ([{'id': id1}], 1)
+        manager.delete_task(id2)
+        assert manager.search("draft") == ([], 0)
+    
     def test_list_tasks_by_priority(self, manager):
         """Test filtering tasks by priority."""
         manager.add_task("Low priority", priority="low")
@@ -93,6 +203,19 @@ class TestTaskManager:
         low_priority = manager.list_tasks(priority="low")
         assert len(low_priority) == 1
     
+    def test_get_task(self, manager):
+        """Test fetching a single task by ID."""
+        task_id = manager.add_task("Task", priority="high")
+        
+        task = manager.get_task(task_id)
+        assert task['description'] == "Task"
+        assert task['priority'] == "high"
+        assert manager.get_task(999) is None
+        
+        # The returned record is a copy
+        task['priority'] = "low"
+        assert manager.list_tasks(priority="high")[0]['id'] == task_id
+    
     def test_complete_task(self, manager):
         """Test marking a task as completed."""
         task_id = manager.add_task("Task to complete")
@@ -145,6 +268,35 @@ class TestTaskManager:
         result = manager.update_task(999, description="New")
         assert result is False
     
+    def test_non_string_fields_rejected(self, manager):
+        """Test that non-string fields are rejected before any state changes."""
+        task_id = manager.add_task("Original", priority="low")
+        
+        with pytest.raises(ValueError):
+            manager.update_task(task_id, priority=5)
+        with pytest.raises(ValueError):
+            manager.add_task("Numeric category", category=5)
+        with pytest.raises(ValueError):
+            manager.add_task(42)
+        
+        assert [t['id'] for t in manager.list_tasks(priority='low')] == [task_id]
+        assert manager.get_statistics()['total'] == 1
+        assert manager.check_statistics(repair=False)
+        assert manager.delete_task(task_id)
+        assert manager.list_tasks() == []
+        # Rejected adds do not use up an ID
+        assert manager.add_task("Next") == task_id + 1
+    
+    def test_null_fields_take_defaults(self, manager):
+        """Test that None priority and category fall back to their defaults."""
+        added = [manager.add_task("Task", priority=None, category=None)]
+        added += manager.apply_batch([{'op': 'add', 'description': "Batch",
+                                       'priority': None, 'category': None}])
+        
+        for task_id in added:
+            task = manager.get_task(task_id)
+            assert (task['priority'], task['category']) == ('medium', 'general')
+    
     def test_clear_completed(self, manager):
         """Test clearing completed tasks."""
         id1 = manager.add_task("Pending task")
@@ -159,6 +311,75 @@ class TestTaskManager:
         assert len(manager.tasks) == 1
         assert manager.tasks[0]['id'] == id1
     
+    def test_apply_batch(self, manager):
+        """Test applying a batch of operations with a single persist."""
+        existing = manager.add_task("Existing task")
+        
+        results = manager.apply_batch([
+            {'op': 'add', 'description': "Batch task 1", 'category': "work"},
+            {'op': 'add', 'description': "Batch task 2", 'priority': "high"},
+            {'op': 'complete', 'id': existing},
+            {'op': 'update', 'id': 3, 'description': "Renamed"},
+            {'op': 'delete', 'id': 2},
+        ])
+        assert results == [2, 3, existing, 3, 2]
+        assert [t['description'] for t in manager.tasks] == ["Existing task", "Renamed"]
+        assert manager.tasks[0]['status'] == "completed"
+        
+        with open(f"{manager.data_file}.log") as f:
+            assert len(f.readlines()) == 6
+        assert TaskManager(manager.data_file).tasks == manager.tasks
+    
+    def test_apply_batch_is_atomic(self, manager):
+        """Test that an invalid operation rejects the whole batch."""
+        task_id = manager.add_task("Task")
+        
+        for operations in ([{'op': 'add', 'description': "New"},
+                            {'op': 'complete', 'id': 999}],
+                           [{'op': 'delete', 'id': task_id},
+                            {'op': 'update', 'id': task_id, 'priority': "low"}],
+                           [{'op': 'add', 'description': "  "}],
+                           [{'op': 'archive', 'id': task_id}],
+                           [{'op': 'complete', 'id': task_id},
+                            {'op': 'add', 'description': "x", 'category': 5}],
+                           [{'op': 'update', 'id': task_id, 'priority': 7}],
+                           [{'op': 'update', 'id': task_id, 'description': "  "}]):
+            with pytest.raises(ValueError):
+                manager.apply_batch(operations)
+        
+        assert [t['id'] for t in manager.tasks] == [task_id]
+        assert manager.tasks[0]['status'] == "pending"
+        assert [t['id'] for t in manager.list_tasks(status='pending')] == [task_id]
+        assert manager.check_statistics(repair=False)
+        assert manager.add_task("Next") == task_id + 1
+    
+    def test_apply_batch_rolls_back_failures(self, manager, monkeypatch):
+        """Test that a failure while applying a valid batch undoes it in memory."""
+        id1 = manager.add_task("First")
+        id2 = manager.add_task("Second")
+        version = manager.version
+        
+        apply_delete = manager._apply_delete
+        def failing_delete(task_ids):
+            # Fail once, after removing the task; the rollback deletes normally
+            monkeypatch.undo()
+            apply_delete(task_ids)
+            raise RuntimeError("Simulated failure")
+        monkeypatch.setattr(manager, '_apply_delete', failing_delete)
+        
+        with pytest.raises(RuntimeError):
+            manager.apply_batch([{'op': 'complete', 'id': id1},
+                                 {'op': 'add', 'description': "Third"},
+                                 {'op': 'update', 'id': id2, 'priority': "high"},
+                                 {'op': 'delete', 'id': id2}])
+        
+        assert [(t['id'], t['status'], t['priority']) for t in manager.tasks] == [
+            (id1, 'pending', 'medium'), (id2, 'pending', 'medium')]
+        assert manager.version == version
+        assert manager.check_statistics(repair=False)
+        assert manager.search("second", limit=5)[1] == 1
+        assert manager.add_task("Third") == id2 + 1
+    
     def test_get_statistics(self, manager):
         """Test getting task statistics."""
         # Add tasks with different properties
@@ -181,6 +402,54 @@ class TestTaskManager:
         assert stats['by_category']['work'] == 2
         assert stats['by_category']['personal'] == 2
     
+    def test_statistics_follow_mutations(self, manager):
+        """Test that running statistics track updates and deletes."""
+        id1 = manager.add_task("Task 1", priority="high", category="work")
+        id2 = manager.add_task("Task 2", priority="low", category="work")
+        manager.update_task(id1, priority="medium", category="home")
+        manager.complete_task(id2)
+        manager.delete_task(id1)
+        
+        stats = manager.get_statistics()
+        assert stats['total'] == 1
+        assert stats['completed'] == 1
+        assert stats['by_priority'] == {'low': 1}
+        assert stats['by_category'] == {'work': 1}
+        assert manager.check_statistics() is True
+    
+    def test_check_statistics_repairs_drift(self, manager):
+        """Test that the consistency check detects and rebuilds bad counters."""
+        manager.add_task("Task 1", category="work")
+        manager._category_counts['work'] = 5
+        
+        assert manager.check_statistics() is False
+        assert manager.get_statistics()['by_category'] == {'work': 1}
+        assert manager.check_statistics() is True
+    
+    def test_columnar_matches_indexes(self, tmp_path, manager):
+        """Test that the columnar table gives the same listings and statistics."""
+        columnar = TaskManager(str(tmp_path / "columnar.json"), columnar=True)
+        for m in (manager, columnar):
+            ids = [m.add_task(f"Task {i}", priority=["low", "high"][i % 2],
+                              category=["Work", "home", "work"][i % 3])
+                   for i in range(12)]
+            m.complete_task(ids[3])
+            m.complete_task(ids[0])
+            m.update_task(ids[5], priority="medium", category="errands")
+            m.delete_task(ids[7])
+            m.delete_task(ids[11])
+        
+        for filters in [{}, {'status': 'pending'}, {'status': 'completed'},
+                        {'category': 'WORK'}, {'priority': 'high', 'category': 'home'},
+                        {'priority': 'urgent'}]:
+            assert ([t['id'] for t in columnar.list_tasks(**filters)]
+                    == [t['id'] for t in manager.list_tasks(**filters)])
+            assert ([t['id'] for t in columnar.iter_tasks(**filters, batch_size=2)]
+                    == [t['id'] for t in manager.list_tasks(**filters)])
+        assert columnar.get_statistics() == manager.get_statistics()
+        assert TaskManager(columnar.data_file, columnar=True).get_statistics() == \
+            manager.get_statistics()
+    
     def test_get_statistics_empty(self, manager):
         """Test statistics with no tasks."""
         stats = manager.get_statistics()
@@ -207,4 +476,110 @@ class TestTaskManager:
         
         assert len(manager2.tasks) == 2
         assert manager2.tasks[0]['description'] == "Persistent task 1"
-        assert manager2.tasks[1]['status'] == "completed"
\ No newline at end of file
+        assert manager2.tasks[1]['status'] == "completed"
+    
+    def test_ids_not_reused_after_delete(self, tmp_path):
+        """Test that the ID counter is monotonic and persisted."""
+        data_file = tmp_path / "ids_tasks.json"
+        
+        manager1 = TaskManager(str(data_file))
+        manager1.add_task("Task 1")
+        id2 = manager1.add_task("Task 2")
+        manager1.delete_task(id2)
+        assert manager1.add_task("Task 3") == 3
+        
+        manager1.delete_task(3)
+        manager1.store.compact(*manager1.store.load())
+        
+        manager2 = TaskManager(str(data_file))
+        assert manager2.add_task("Task 4") == 4
+    
+    def test_version_is_monotonic_and_persisted(self, tmp_path):
+        """Test that the data version counts changes and survives reloads."""
+        data_file = str(tmp_path / "version_tasks.json")
+        manager = TaskManager(data_file, store=AppendLogStore(data_file, compact_threshold=4))
+        assert manager.version == 0
+        
+        task_id = manager.add_task("Task 1")
+        manager.complete_task(task_id)
+        manager.clear_completed()
+        manager.clear_completed()  # nothing to clear, so no change
+        assert manager.version == 3
+        
+        manager.apply_batch([{'op': 'add', 'description': "Task 2"},
+                             {'op': 'add', 'description': "Task 3"}])  # compacts
+        assert manager.version == 5
+        assert TaskManager(data_file).version == 5
+    
+    def test_subscribe_publishes_deltas(self, manager):
+        """Test that each change publishes one small event with its version."""
+        events = []
+        unsubscribe = manager.subscribe(events.append)
+        
+        task_id = manager.add_task("Task 1", priority="high")
+        manager.update_task(task_id, description="Task 1 updated")
+        manager.complete_task(task_id)
+        manager.clear_completed()
+        manager.apply_batch([{'op': 'add', 'description': "Task 2"},
+                             {'op': 'complete', 'id': 2},
+                             {'op': 'delete', 'id': 2}])
+        
+        assert [(e['type'], e['version']) for e in events] == [
+            ('created', 1), ('updated', 2), ('completed', 3), ('deleted', 4),
+            ('created', 5), ('deleted', 7)]
+        assert events[0]['task']['priority'] == "high"
+        assert events[1]['task']['description'] == "Task 1 updated"
+        assert events[3]['ids'] == [task_id]
+        
+        unsubscribe()
+        manager.add_task("Task 3")
+        assert len(events) == 6
+    
+    def test_load_legacy_list_format(self, tmp_path):
+        """Test loading a data file holding a bare list of tasks."""
+        data_file = tmp_path / "legacy_tasks.json"
+        data_file.write_text(json.dumps([
+            {'id': 7, 'description': 'Old task', 'priority': 'low',
+             'category': 'general', 'status': 'pending',
+             'created_at': datetime.now().isoformat(), 'completed_at': None}
+        ]))
+        
+        manager = TaskManager(str(data_file))
+        assert manager.tasks[0]['id'] == 7
+        assert manager.add_task("New task") == 8
+    
+    def test_batched_durability(self, tmp_path):
+        """Test that batched mode defers writes until a flush."""
+        data_file = str(tmp_path / "batched_tasks.json")
+        manager = TaskManager(data_file, durability='batched', flush_interval=60)
+        manager.add_task("Task 1")
+        manager.complete_task(1)
+        
+        assert manager.tasks[0]['status'] == 'completed'
+        assert TaskManager(data_file).tasks == []
+        
+        manager.flush()
+        assert TaskManager(data_file).tasks == manager.tasks
+        
+        manager.add_task("Task 2")
+        manager.close()
+        assert len(TaskManager(data_file).tasks) == 2
+    
+    def test_batched_flush_threshold(self, tmp_path):
+        """Test that the background flusher runs once enough changes queue up."""
+        data_file = str(tmp_path / "threshold_tasks.json")
+        with TaskManager(data_file, durability='batched', flush_interval=60,
+                         flush_threshold=3) as manager:
+            for i in range(3):
+                manager.add_task(f"Task {i}")
+            for _ in range(100):
+                if len(TaskManager(data_file).tasks) == 3:
+                    break
+                time.sleep(0.01)
+            assert len(TaskManager(data_file).tasks) == 3
+            assert manager._pending_records == []
+    
+    def test_invalid_durability(self, tmp_path):
+        """Test that an unknown durability policy is rejected."""
+        with pytest.raises(ValueError):
+            TaskManager(str(tmp_path / "tasks.json"), durability='eventually')
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import './App.css';
 import TaskList from './components/TaskList';
 import TaskForm from './components/TaskForm';
@@ -6,6 +6,41 @@ import TaskFilter from './components/TaskFilter';
 import Statistics from './components/Statistics';
 import { apiClient } from './services/api';
 
+const PAGE_SIZE = 100;
+// Coalesce statistics refreshes triggered by bursts of change events
+const STATISTICS_REFRESH_DELAY = 300;
+
+const matchesFilters = (task, filters) =>
+  (!filters.status || filters.status === 'all' || task.status === filters.status) &&
+  (!filters.category || task.category.toLowerCase() === filters.category.toLowerCase()) &&
+  (!filters.priority || task.priority === filters.priority);
+
+// Same order as the API: pending first, then by creation time
+const compareTasks = (a, b) =>
+  (a.status === 'completed') - (b.status === 'completed') ||
+  a.created_at.localeCompare(b.created_at) ||
+  a.id - b.id;
+
+// Apply a change event from the server to the (filtered) task list
+const applyEvent = (tasks, event, filters) => {
+  if (event.type === 'deleted') {
+    return tasks.filter((task) => !event.ids.includes(task.id));
+  }
+  const rest = tasks.filter((task) => task.id !== event.task.id);
+  if (!matchesFilters(event.task, filters)) return rest;
+  return [...rest, event.task].sort(compareTasks);
+};
+
+// Overlay changes seen while pages were loading onto the loaded pages, so
+// a page fetched before a change cannot bring back the old version
+const mergeChanges = (loaded, changes, filters) => {
+  const merged = loaded.filter((task) => !changes.has(task.id));
+  changes.forEach((task) => {
+    if (task && matchesFilters(task, filters)) merged.push(task);
+  });
+  return merged.sort(compareTasks);
+};
+
 function App() {
   const [tasks, setTasks] = useState([]);
   const [statistics, setStatistics] = useState(null);
@@ -17,23 +52,95 @@ function App() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [activeView, setActiveView] = useState('tasks');
+  // Live change feed state, read from event handlers
+  const filtersRef = useRef(filters);
+  const versionRef = useRef(null);
+  const liveRef = useRef(false);
+  const statisticsTimer = useRef(null);
+  // Changes by task id (null when deleted) seen during the current load
+  const loadRef = useRef(null);
 
   // Load tasks on component mount and when filters change
   useEffect(() => {
+    filtersRef.current = filters;
     loadTasks();
     loadStatistics();
   }, [filters]);
 
+  // Apply server-sent changes instead of refetching after every mutation
+  useEffect(() => {
+    const unsubscribe = apiClient.subscribeEvents(handleEvent, {
+      onError: () => { liveRef.current = false; },
+    });
+    return () => {
+      unsubscribe();
+      clearTimeout(statisticsTimer.current);
+    };
+  }, []);
+
+  const handleEvent = (event) => {
+    if (event.type === 'ready') {
+      liveRef.current = true;
+      // On reconnect, changes may have been missed while disconnected
+      if (versionRef.current !== null && versionRef.current !== event.version) {
+        loadTasks();
+        loadStatistics();
+      }
+      versionRef.current = event.version;
+      return;
+    }
+    if (versionRef.current !== null && event.version <= versionRef.current) return;
+    versionRef.current = event.version;
+
+    if (event.type === 'reload') {
+      loadTasks();
+      loadStatistics();
+      return;
+    }
+    if (loadRef.current) {
+      const { changes } = loadRef.current;
+      if (event.type === 'deleted') {
+        event.ids.forEach((id) => changes.set(id, null));
+      } else {
+        changes.set(event.task.id, event.task);
+      }
+    }
+    setTasks((current) => applyEvent(current, event, filtersRef.current));
+    clearTimeout(statisticsTimer.current);
+    statisticsTimer.current = setTimeout(loadStatistics, STATISTICS_REFRESH_DELAY);
+  };
+
+  // Without the live feed, reload after our own changes
+  const refreshAfterChange = async () => {
+    if (!liveRef.current) {
+      await loadTasks();
+      await loadStatistics();
+    }
+  };
+
   const loadTasks = async () => {
+    const load = { changes: new Map() };
+    loadRef.current = load;
     setLoading(true);
     setError(null);
     try {
-      const data = await apiClient.getTasks(filters);
-      setTasks(data.tasks);
+      // Render the first page as soon as it arrives, then append the rest.
+      // Filters come from the ref because event handlers hold an old closure.
+      let loaded = [];
+      for await (const page of apiClient.iterTaskPages(filtersRef.current, PAGE_SIZE)) {
+        // A newer load (e.g. after a filter change) owns the list now
+        if (loadRef.current !== load) return;
+        loaded = loaded.concat(page);
+        setTasks(mergeChanges(loaded, load.changes, filtersRef.current));
+        setLoading(false);
+      }
     } catch (err) {
-      setError('Failed to load tasks: ' + err.message);
+      if (loadRef.current === load) setError('Failed to load tasks: ' + err.message);
     } finally {
-      setLoading(false);
+      if (loadRef.current === load) {
+        loadRef.current = null;
+        setLoading(false);
+      }
     }
   };
 
@@ -49,8 +156,7 @@ function App() {
   const handleAddTask = async (taskData) => {
     try {
       await apiClient.createTask(taskData);
-      await loadTasks();
-      await loadStatistics();
+      await refreshAfterChange();
     } catch (err) {
       setError('Failed to add task: ' + err.message);
     }
@@ -59,8 +165,7 @@ function App() {
   const handleCompleteTask = async (taskId) => {
     try {
       await apiClient.completeTask(taskId);
-      await loadTasks();
-      await loadStatistics();
+      await refreshAfterChange();
     } catch (err) {
       setError('Failed to complete task: ' + err.message);
     }
@@ -69,8 +174,7 @@ function App() {
   const handleDeleteTask = async (taskId) => {
     try {
       await apiClient.deleteTask(taskId);
-      await loadTasks();
-      await loadStatistics();
+      await refreshAfterChange();
     } catch (err) {
       setError('Failed to delete task: ' + err.message);
     }
@@ -79,8 +183,7 @@ function App() {
   const handleUpdateTask = async (taskId, updates) => {
     try {
       await apiClient.updateTask(taskId, updates);
-      await loadTasks();
-      await loadStatistics();
+      await refreshAfterChange();
     } catch (err) {
       setError('Failed to update task: ' + err.message);
     }
@@ -90,8 +193,7 @@ function App() {
     if (window.confirm('Are you sure you want to clear all completed tasks?')) {
       try {
         await apiClient.clearCompleted();
-        await loadTasks();
-        await loadStatistics();
+        await refreshAfterChange();
       } catch (err) {
         setError('Failed to clear completed tasks: ' + err.message);
       }
@@ -2,6 +2,14 @@ import axios from 'axios';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5001/api';
 
+// Number of GET responses kept for conditional revalidation
+const CACHE_SIZE = 100;
+
+// Sent with mutations: the UI never reads the echoed task, so skip it
+const MINIMAL = { headers: { Prefer: 'return=minimal' } };
+
+const EVENT_TYPES = ['ready', 'created', 'updated', 'completed', 'deleted', 'reload'];
+
 class ApiClient {
   constructor() {
     this.client = axios.create({
@@ -10,6 +18,31 @@ class ApiClient {
         'Content-Type': 'application/json',
       },
     });
+    // url -> { etag, data }, oldest first
+    this.cache = new Map();
+  }
+
+  // GET with If-None-Match; a 304 is answered from the local cache
+  async getCached(url) {
+    const cached = this.cache.get(url);
+    const response = await this.client.get(url, {
+      headers: cached ? { 'If-None-Match': cached.etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+    this.cache.delete(url);
+    if (response.status === 304 && cached) {
+      this.cache.set(url, cached);
+      return cached.data;
+    }
+
+    const etag = response.headers.etag;
+    if (etag) {
+      this.cache.set(url, { etag, data: response.data });
+      if (this.cache.size > CACHE_SIZE) {
+        this.cache.delete(this.cache.keys().next().value);
+      }
+    }
+    return response.data;
   }
 
   async getTasks(filters = {}) {
@@ -18,38 +51,74 @@ class ApiClient {
     if (filters.category) params.append('category', filters.category);
     if (filters.priority) params.append('priority', filters.priority);
     
-    const response = await this.client.get(`/tasks?${params}`);
-    return response.data;
+    return this.getCached(`/tasks?${params}`);
+  }
+
+  async getTasksPage(filters = {}, { cursor, limit, fields } = {}) {
+    const params = new URLSearchParams();
+    if (filters.status) params.append('status', filters.status);
+    if (filters.category) params.append('category', filters.category);
+    if (filters.priority) params.append('priority', filters.priority);
+    if (cursor) params.append('cursor', cursor);
+    if (limit) params.append('limit', limit);
+    if (fields) params.append('fields', fields.join(','));
+    
+    return this.getCached(`/tasks?${params}`);
+  }
+
+  // Yields one page (array of tasks) at a time, fetching the next lazily
+  async *iterTaskPages(filters = {}, pageSize = 100, fields) {
+    let cursor = null;
+    do {
+      const data = await this.getTasksPage(filters, { cursor, limit: pageSize, fields });
+      yield data.tasks;
+      cursor = data.next_cursor;
+    } while (cursor);
+  }
+
+  async getTask(taskId) {
+    return this.getCached(`/tasks/${taskId}`);
   }
 
   async createTask(taskData) {
-    const response = await this.client.post('/tasks', taskData);
+    const response = await this.client.post('/tasks', taskData, MINIMAL);
     return response.data;
   }
 
   async updateTask(taskId, updates) {
-    const response = await this.client.put(`/tasks/${taskId}`, updates);
+    const response = await this.client.put(`/tasks/${taskId}`, updates, MINIMAL);
     return response.data;
   }
 
   async completeTask(taskId) {
-    const response = await this.client.post(`/tasks/${taskId}/complete`);
+    const response = await this.client.post(`/tasks/${taskId}/complete`, null, MINIMAL);
     return response.data;
   }
 
   async deleteTask(taskId) {
-    const response = await this.client.delete(`/tasks/${taskId}`);
+    const response = await this.client.delete(`/tasks/${taskId}`, MINIMAL);
     return response.data;
   }
 
   async clearCompleted() {
-    const response = await this.client.post('/tasks/clear-completed');
+    const response = await this.client.post('/tasks/clear-completed', null, MINIMAL);
     return response.data;
   }
 
   async getStatistics() {
-    const response = await this.client.get('/statistics');
-    return response.data;
+    return this.getCached('/statistics');
+  }
+
+  // Subscribe to server-sent task change events; returns an unsubscribe function.
+  // onOpen/onError report whether the live feed is currently connected.
+  subscribeEvents(onEvent, { onOpen, onError } = {}) {
+    const source = new EventSource(`${API_BASE_URL}/events`);
+    EVENT_TYPES.forEach((type) => {
+      source.addEventListener(type, (e) => onEvent(JSON.parse(e.data)));
+    });
+    if (onOpen) source.onopen = onOpen;
+    if (onError) source.onerror = onError;
+    return () => source.close();
   }
 }
 
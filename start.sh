@@ -21,7 +21,8 @@ trap cleanup EXIT INT TERM
 # Start Backend API
 echo "Starting Backend API on port 5001..."
 cd backend
-python3 app.py &
+# Production ASGI server; use "python3 app.py" for the Flask debug server
+python3 serve.py &
 BACKEND_PID=$!
 cd ..
 